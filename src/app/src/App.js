@@ -1,6 +1,9 @@
 import './App.css';
 import React, { useState, useEffect } from 'react';
-import { getTodos, postTodo } from './api';
+import { getTodos, postTodo, subscribeTodoEvents } from './api';
+
+// Coalesce bursts of change events into one refetch
+const REFRESH_DEBOUNCE_MS = 250;
 
 export function App() {
   const [todos, setTodos] = useState([]);
@@ -26,6 +29,20 @@ export function App() {
     fetchTodos();
   }, [page]);
 
+  // Refresh when the server reports a change instead of polling
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return undefined;
+    let timer = null;
+    const unsubscribe = subscribeTodoEvents(() => {
+      clearTimeout(timer);
+      timer = setTimeout(fetchTodos, REFRESH_DEBOUNCE_MS);
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, [page]);
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setError(null);
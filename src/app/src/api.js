@@ -21,4 +21,12 @@ export const postTodo = async (text) => {
   return response.data;
 };
 
+// Subscribe to the server's todo change feed (SSE). Returns an unsubscribe fn.
+export const subscribeTodoEvents = (onChange) => {
+  const source = new EventSource(`${api.defaults.baseURL}/todos/events/`);
+  ['insert', 'update', 'delete', 'reset'].forEach((type) =>
+    source.addEventListener(type, onChange));
+  return () => source.close();
+};
+
 export default api;
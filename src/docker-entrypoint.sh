@@ -3,4 +3,6 @@ set -euo pipefail
 
 cd /src/rest
 
-exec gunicorn rest.wsgi:application -b 0.0.0.0:8000 --workers 3 --preload --timeout 120 --worker-tmp-dir /dev/shm
+# Worker/thread sizing, preload, DB wait and per-worker Mongo clients are
+# handled in gunicorn.conf.py. SERVER_MODE=asgi serves the ASGI app (SSE).
+exec gunicorn -c gunicorn.conf.py
@@ -0,0 +1,84 @@
+"""Benchmark response compression: bytes saved vs CPU time per encoding.
+
+Builds payloads shaped like ``GET /todos/`` responses at several page sizes
+and runs every installed codec over them, both whole-body and streamed in
+chunks.
+
+Usage (from src/rest):
+    python -m benchmarks.compression [--page-sizes 10,100,1000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from rest.compression import available_codecs
+
+
+def build_payload(page_size):
+    """Return a JSON list response body with `page_size` todos."""
+    now = datetime(2024, 1, 1)
+    results = [
+        {
+            'id': os.urandom(12).hex(),
+            'text': f'Todo item number {i}: remember to follow up on task {i % 37}',
+            'created_at': (now + timedelta(seconds=i)).isoformat(),
+            'completed': i % 3 == 0,
+        }
+        for i in range(page_size)
+    ]
+    body = {
+        'results': results,
+        'page': 1,
+        'page_size': page_size,
+        'total': page_size * 10,
+        'total_pages': 10,
+    }
+    return json.dumps(body).encode('utf-8')
+
+
+def _time(fn, repeat):
+    """Return (cpu_seconds, wall_seconds) per call and the last result."""
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    cpu = (time.process_time() - cpu_start) / repeat
+    wall = (time.perf_counter() - wall_start) / repeat
+    return cpu, wall, out
+
+
+def run(page_sizes, levels, repeat, chunk_size):
+    codecs = available_codecs()
+    print(f"{'page_size':>9} {'codec':>6} {'level':>5} {'raw':>9} {'out':>9} "
+          f"{'saved':>9} {'ratio':>6} {'cpu_ms':>8} {'wall_ms':>8} {'stream_cpu_ms':>13} "
+          f"{'KB_saved/cpu_ms':>15}")
+    for page_size in page_sizes:
+        payload = build_payload(page_size)
+        chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+        for name, codec_cls in codecs.items():
+            for level in levels.get(name, [None]):
+                codec = codec_cls(level)
+                cpu, wall, out = _time(lambda: codec.compress(payload), repeat)
+                stream_cpu, _, _ = _time(lambda: b''.join(codec.stream(iter(chunks))), repeat)
+                saved = len(payload) - len(out)
+                print(f"{page_size:>9} {name:>6} {codec.level:>5} {len(payload):>9} {len(out):>9} "
+                      f"{saved:>9} {len(out) / len(payload):>6.3f} {cpu * 1000:>8.3f} "
+                      f"{wall * 1000:>8.3f} {stream_cpu * 1000:>13.3f} "
+                      f"{saved / 1024 / max(cpu * 1000, 1e-6):>15.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--page-sizes', default='10,100,1000,5000')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--chunk-size', type=int, default=8192)
+    args = parser.parse_args()
+
+    page_sizes = [int(p) for p in args.page_sizes.split(',')]
+    levels = {'gzip': [1, 6, 9], 'br': [1, 4, 11], 'zstd': [1, 3, 19]}
+    run(page_sizes, levels, args.repeat, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Measure working-set size of legacy vs compact stored todos.
+
+Always reports BSON document sizes computed locally. With ``--mongo`` it
+also loads legacy documents into a scratch collection (``bench_schema_todos``),
+runs the schema migration and compares collStats before and after.
+
+Usage (from src/rest):
+    python -m benchmarks.schema [--size 100000] [--mongo]
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rest.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import bson  # noqa: E402
+from bson import ObjectId  # noqa: E402
+from todos import schema  # noqa: E402
+from todos.backends.mongo import MongoBackend  # noqa: E402
+
+WORDS = ['buy', 'milk', 'call', 'mom', 'fix', 'bug', 'write', 'report', 'walk', 'dog']
+
+
+def make_legacy_docs(size, rng):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            '_id': ObjectId(),
+            'text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 8))),
+            'created_at': start + timedelta(seconds=i * 30),
+            'completed': rng.random() < 0.3,
+        }
+        for i in range(size)
+    ]
+
+
+def bson_sizes(docs, size):
+    legacy = sum(len(bson.encode(doc)) for doc in docs)
+    compact = sum(len(bson.encode(schema.encode(doc))) for doc in docs)
+    print(f"BSON, {size} docs")
+    print(f"  legacy  total={legacy:>12} avg={legacy / size:>8.1f}")
+    print(f"  compact total={compact:>12} avg={compact / size:>8.1f}")
+    print(f"  saved   {1 - compact / legacy:.1%}")
+
+
+def print_stats(label, stats):
+    print(f"  {label:<7} size={stats.get('size', 0):>12} avg_obj={stats.get('avg_obj_size', 0):>6} "
+          f"storage={stats.get('storage_size', 0):>12} indexes={stats.get('total_index_size', 0):>12}")
+
+
+def mongo_migration(docs, batch_size):
+    backend = MongoBackend(collection='bench_schema_todos', stats_collection='bench_schema_stats')
+    collection = backend.get_collection()
+    collection.drop()
+    # load in the legacy layout, bypassing the schema layer
+    collection.insert_many(docs, ordered=False)
+    backend.ensure_indexes()
+    print(f"MongoDB collStats, {len(docs)} docs")
+    print_stats('before', backend.storage_stats())
+
+    start = time.perf_counter()
+    last_id = None
+    while True:
+        _, last_id = backend.migrate_schema_batch(last_id, batch_size)
+        if last_id is None:
+            break
+    elapsed = time.perf_counter() - start
+    backend.drop_legacy_indexes()
+    print_stats('after', backend.storage_stats())
+    print(f"  migrated in {elapsed:.2f}s ({len(docs) / elapsed:.0f} docs/s); "
+          f"{backend.count_unmigrated()} remaining")
+    collection.drop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--mongo', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    docs = make_legacy_docs(args.size, random.Random(args.seed))
+    bson_sizes(docs, args.size)
+    if args.mongo:
+        mongo_migration(docs, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
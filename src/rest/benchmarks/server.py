@@ -0,0 +1,189 @@
+"""Compare gunicorn worker configurations: boot time and throughput.
+
+For each configuration a server is started with gunicorn.conf.py on a free
+port. Boot time is measured until /health/ answers 200; then concurrent
+keep-alive clients hit GET /todos/ for a fixed duration.
+
+Runs against the in-memory backend by default so no mongod is needed
+(pass --backend mongo to use the configured MongoDB). With the memory
+backend each worker has its own seeded store, so list snapshots are served
+even though the change feed is local.
+
+In asgi mode each worker is a single event loop, so configs are
+``<workers>x1``. More than one asgi worker needs a shared change feed
+(``--backend mongo`` against a replica set); without one gunicorn.conf.py
+runs a single worker, which is reported in the ``workers`` column.
+
+Usage (from src/rest):
+    python -m benchmarks.server [--configs 1x1,2x4,4x4] [--mode wsgi|asgi]
+        [--clients 32] [--duration 10] [--list-snapshots ""] [--backend memory|mongo]
+"""
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIGS = {'wsgi': '1x1,1x4,2x4,4x4', 'asgi': '1x1,2x1,4x1'}
+# logged by gunicorn.conf.py when it overrides the worker count
+SINGLE_WORKER_LOG = 'running 1 worker instead of'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_healthy(port, proc, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health/')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError('server did not become healthy')
+
+
+def seed(port, count):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    for i in range(count):
+        conn.request('POST', '/todos/', body=f'{{"text": "seed todo {i}"}}',
+                     headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+
+
+def load(port, clients, duration, path):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        mine = []
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            if ok:
+                mine.append(time.perf_counter() - start)
+            else:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors[0]
+
+
+def config_error(workers, threads, args):
+    """Return why `args` can't measure this config, or None."""
+    if args.mode != 'asgi':
+        return None
+    if threads != '1':
+        return 'asgi workers are single event loops; use <workers>x1'
+    if args.backend == 'memory' and int(workers) > 1:
+        return ('the memory backend has no shared change feed, so gunicorn would '
+                'run 1 worker; use --backend mongo against a replica set')
+    return None
+
+
+def run_config(config, args):
+    workers, threads = config.split('x')
+    error = config_error(workers, threads, args)
+    if error:
+        print(f"{args.mode:>5} {config:>7} skipped: {error}")
+        return
+    port = free_port()
+    env = dict(
+        os.environ,
+        SERVER_MODE=args.mode,
+        PORT=str(port),
+        GUNICORN_WORKERS=workers,
+        GUNICORN_THREADS=threads,
+        TODO_STORAGE_BACKEND=args.backend,
+        ALLOWED_HOSTS='127.0.0.1,localhost',
+    )
+    if args.backend == 'memory':
+        # each worker is the only writer to its own store
+        env['TODO_LIST_SNAPSHOTS_LOCAL_FEED'] = '1'
+    if args.list_snapshots is not None:
+        env['TODO_LIST_SNAPSHOTS'] = args.list_snapshots
+    log = tempfile.TemporaryFile(mode='w+')
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--log-level', 'warning'],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=log,
+    )
+    try:
+        wait_healthy(port, proc, args.boot_timeout)
+        boot = time.perf_counter() - start
+        seed(port, args.seed)
+        latencies, errors = load(port, args.clients, args.duration, f'/todos/?page=1&page_size={args.page_size}')
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+        log.seek(0)
+        ran_workers = 1 if SINGLE_WORKER_LOG in log.read() else int(workers)
+        log.close()
+
+    if latencies:
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1e3
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e3
+    else:
+        p50 = p99 = float('nan')
+    print(f"{args.mode:>5} {config:>7} {ran_workers:>7} {boot:>8.2f} "
+          f"{len(latencies) / args.duration:>9.0f} {p50:>8.2f} {p99:>8.2f} {errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--configs', default=None,
+                        help='Comma-separated <workers>x<threads> configurations '
+                             '(default depends on --mode).')
+    parser.add_argument('--mode', default='wsgi', choices=['wsgi', 'asgi'])
+    parser.add_argument('--backend', default='memory')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=50)
+    parser.add_argument('--boot-timeout', type=float, default=150)
+    parser.add_argument('--list-snapshots', default=None,
+                        help='TODO_LIST_SNAPSHOTS for the server ("" disables pre-rendered pages).')
+    args = parser.parse_args()
+
+    configs = args.configs or DEFAULT_CONFIGS[args.mode]
+    print(f"{'mode':>5} {'config':>7} {'workers':>7} {'boot_s':>8} {'req/s':>9} "
+          f"{'p50_ms':>8} {'p99_ms':>8} {'errors':>7}")
+    for config in configs.split(','):
+        run_config(config.strip(), args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark storage backends on the operations TodoDAO performs.
+
+Seeds each backend with N todos via bulk insert, then times counts, paging
+(first and deep pages), text and created_at range queries, point reads,
+updates and deletes.
+
+The Mongo backend runs against scratch collections (``bench_todos``),
+never the real ``todos`` collection, and drops them afterwards.
+
+Usage (from src/rest):
+    python -m benchmarks.storage [--backends memory,mongo] [--size 100000]
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rest.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from todos.backends.memory import MemoryBackend  # noqa: E402
+from todos.backends.mongo import MongoBackend  # noqa: E402
+
+WORDS = ['buy', 'milk', 'call', 'mom', 'fix', 'bug', 'write', 'report', 'walk', 'dog',
+         'book', 'flight', 'pay', 'rent', 'review', 'pr', 'clean', 'desk', 'plan', 'trip']
+
+
+def make_backend(name):
+    if name == 'memory':
+        return MemoryBackend()
+    if name == 'mongo':
+        return MongoBackend(collection='bench_todos', stats_collection='bench_todo_stats')
+    raise ValueError(f"Unknown backend {name}")
+
+
+def cleanup(backend):
+    if isinstance(backend, MongoBackend):
+        backend.get_collection().drop()
+        backend.get_stats_collection().drop()
+
+
+def make_docs(size, rng):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'text': ' '.join(rng.choice(WORDS) for _ in range(4)),
+            'created_at': start + timedelta(seconds=i * 30),
+            'completed': rng.random() < 0.3,
+        }
+        for i in range(size)
+    ]
+
+
+def timed(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_op = (time.perf_counter() - start) / repeat
+    print(f"  {label:<28} {per_op * 1e6:>12.1f} us/op")
+
+
+def run(name, size, repeat, page_size, seed):
+    rng = random.Random(seed)
+    backend = make_backend(name)
+    cleanup(backend)
+    backend.ensure_indexes()
+    docs = make_docs(size, rng)
+    print(f"{name}: {size} todos")
+
+    start = time.perf_counter()
+    ids = backend.insert_many(docs)
+    print(f"  {'bulk insert':<28} {(time.perf_counter() - start) * 1e3:>12.1f} ms total")
+
+    mid = datetime(2024, 1, 1) + timedelta(seconds=size * 15)
+    day = timedelta(days=1)
+    deep_skip = max(size - page_size, 0)
+    timed('count all', lambda: backend.count({}), repeat)
+    timed('count completed', lambda: backend.count({'completed': True}), repeat)
+    timed('count created_at range', lambda: backend.count({'created_at': {'$gte': mid, '$lt': mid + day}}), repeat)
+    timed('count $text', lambda: backend.count({'$text': {'$search': 'milk'}}), repeat)
+    timed('find page 1', lambda: backend.find({}, 0, page_size), repeat)
+    timed('find last page', lambda: backend.find({}, deep_skip, page_size), repeat)
+    timed('find completed page 1', lambda: backend.find({'completed': True}, 0, page_size), repeat)
+    timed('find $text page 1', lambda: backend.find({'$text': {'$search': 'dog'}}, 0, page_size), repeat)
+    timed('get by id', lambda: backend.get(rng.choice(ids)), repeat)
+    timed('update completed', lambda: backend.update(rng.choice(ids), {'completed': True}), repeat)
+    timed('update text', lambda: backend.update(rng.choice(ids), {'text': 'pay rent'}), repeat)
+
+    victims = ids[:repeat]
+    start = time.perf_counter()
+    for oid in victims:
+        backend.delete(oid)
+    print(f"  {'delete':<28} {(time.perf_counter() - start) / len(victims) * 1e6:>12.1f} us/op")
+
+    start = time.perf_counter()
+    removed = backend.delete_many(ids[repeat:repeat + size // 10])
+    print(f"  {'bulk delete':<28} {(time.perf_counter() - start) * 1e3:>12.1f} ms total ({removed} docs)")
+
+    start = time.perf_counter()
+    backend.rebuild_stats()
+    print(f"  {'rebuild stats':<28} {(time.perf_counter() - start) * 1e3:>12.1f} ms total")
+    cleanup(backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', default='memory')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for name in args.backends.split(','):
+        run(name.strip(), args.size, args.repeat, args.page_size, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Gunicorn configuration for production.
+
+Serves either the WSGI app (threaded workers) or the ASGI app (uvicorn
+workers, needed for the /todos/events/ SSE feed), selected by
+SERVER_MODE=wsgi|asgi. Worker and thread counts are sized from the CPUs
+actually available to the container unless set explicitly.
+
+The app is preloaded in the master, so Django setup and the DB wait run
+once; each worker then opens its own MongoDB connection pool after fork.
+
+The /todos/events/ feed and the list snapshots only see other workers'
+writes through a MongoDB change stream. In asgi mode without one (a
+standalone mongod, or the memory backend) the server is limited to a single
+worker, with a warning, so every client sees every write.
+
+Reloads: `kill -HUP <master>` replaces workers gracefully but reuses the
+preloaded code. To roll out new code without dropping connections, send
+USR2 (start a new master), then WINCH and QUIT to the old one - or set
+GUNICORN_PRELOAD=0 so HUP re-imports the app.
+
+Environment:
+    SERVER_MODE        wsgi (default) or asgi
+    PORT               listen port (default 8000)
+    GUNICORN_WORKERS   worker processes (alias: WEB_CONCURRENCY)
+    GUNICORN_THREADS   threads per WSGI worker
+    GUNICORN_TIMEOUT   worker timeout in seconds (default 120)
+    GUNICORN_PRELOAD   preload the app in the master (default 1)
+"""
+import math
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def available_cpus():
+    """CPUs this process may use: affinity mask capped by the cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            q, period = f.read().split()
+            if q != 'max':
+                quota = int(q) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+                q = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+            if q > 0:
+                quota = q / period
+        except (OSError, ValueError):
+            pass
+
+    if quota:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+CPUS = available_cpus()
+
+bind = f"0.0.0.0:{_env_int('PORT', 8000)}"
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+timeout = _env_int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = 30
+keepalive = 5
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = max_requests // 10
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'rest.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    # one event loop per core; idle SSE connections cost no threads
+    workers = _env_int('GUNICORN_WORKERS', _env_int('WEB_CONCURRENCY', CPUS))
+else:
+    wsgi_app = 'rest.wsgi:application'
+    worker_class = 'gthread'
+    # requests mostly wait on MongoDB, so a few threads per process keep
+    # cores busy without the memory of extra processes
+    workers = _env_int('GUNICORN_WORKERS', _env_int('WEB_CONCURRENCY', CPUS * 2))
+    threads = _env_int('GUNICORN_THREADS', 4)
+
+
+def _local_feed_reason():
+    """Why the todo change feed can't see other workers' writes, or None."""
+    if not preload_app:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rest.settings')
+        import django
+
+        django.setup()
+    from rest.db import get_mongo_client, reset_mongo_client
+    from todos.dao import TodoDAO
+
+    backend = TodoDAO.get_backend()
+    if backend.name != 'mongo':
+        if backend.supports_change_streams():
+            return None
+        return f"the {backend.name} backend has no change streams"
+    try:
+        if TodoDAO.supports_change_streams():
+            return None
+        return "MongoDB is not a replica set"
+    except Exception as e:
+        return f"could not check MongoDB for a replica set: {type(e).__name__}"
+    finally:
+        # the probe opens the shared client (a pool plus monitor threads);
+        # don't keep it in the master for every worker to inherit
+        get_mongo_client().close()
+        reset_mongo_client()
+
+
+def _limit_workers_for_local_feed(server):
+    if SERVER_MODE != 'asgi' or server.num_workers <= 1:
+        return
+    reason = _local_feed_reason()
+    if reason is None:
+        return
+    server.log.warning(
+        "No shared todo change feed (%s): running 1 worker instead of %d so "
+        "the feed sees every write",
+        reason, server.num_workers,
+    )
+    server.num_workers = 1
+
+
+def on_starting(server):
+    _limit_workers_for_local_feed(server)
+    server.log.info(
+        "Starting %s server: %d CPUs, %d workers x %s threads, preload=%s",
+        SERVER_MODE, CPUS, server.num_workers, globals().get('threads', 1), preload_app,
+    )
+
+
+def on_reload(server):
+    # reload re-reads `workers` from this config
+    _limit_workers_for_local_feed(server)
+
+
+def post_fork(server, worker):
+    # pymongo clients are not fork-safe: give each worker its own pool
+    from rest.db import reset_mongo_client
+
+    reset_mongo_client()
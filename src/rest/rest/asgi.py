@@ -3,6 +3,9 @@ ASGI config for rest project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Requests for the todo change feed (``/todos/events/``) are served by the
+streaming SSE app in ``rest.sse``; everything else goes to Django.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
 """
@@ -13,4 +16,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rest.settings')
 
-application = get_asgi_application()
+from rest.startup import maybe_wait_for_db  # noqa: E402
+
+maybe_wait_for_db()
+
+django_application = get_asgi_application()
+
+# imported after Django is set up
+from rest.sse import EVENTS_PATH, events_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        return await events_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,150 @@
+"""Content-encoding codecs used for HTTP response compression.
+
+Kept free of Django imports so the codecs can be exercised directly
+(e.g. from benchmarks) without configuring settings.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+class GzipCodec:
+    """gzip encoding backed by zlib (always available)."""
+
+    name = 'gzip'
+    default_level = 6
+
+    def __init__(self, level=None):
+        self.level = self.default_level if level is None else level
+
+    def _compressobj(self):
+        # wbits=31 -> gzip container with a 32K window
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        """Compress a complete payload."""
+        c = self._compressobj()
+        return c.compress(data) + c.flush()
+
+    def stream(self, chunks):
+        """Compress an iterable of byte chunks, flushing after each one.
+
+        A sync flush per chunk keeps streaming responses incremental: every
+        chunk the view yields is decodable by the client as soon as it lands.
+        """
+        c = self._compressobj()
+        for chunk in chunks:
+            data = c.compress(chunk) + c.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield c.flush()
+
+
+class BrotliCodec:
+    """Brotli encoding (requires the ``brotli`` package)."""
+
+    name = 'br'
+    default_level = 4
+
+    def __init__(self, level=None):
+        self.level = self.default_level if level is None else level
+
+    def compress(self, data):
+        """Compress a complete payload."""
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, chunks):
+        """Compress an iterable of byte chunks, flushing after each one."""
+        c = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            data = c.process(chunk) + c.flush()
+            if data:
+                yield data
+        yield c.finish()
+
+
+class ZstdCodec:
+    """Zstandard encoding (requires the ``zstandard`` package)."""
+
+    name = 'zstd'
+    default_level = 3
+
+    def __init__(self, level=None):
+        self.level = self.default_level if level is None else level
+
+    def compress(self, data):
+        """Compress a complete payload."""
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        """Compress an iterable of byte chunks, flushing after each one."""
+        c = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = c.compress(chunk) + c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield c.flush()
+
+
+def available_codecs():
+    """Return codec classes usable in this process, keyed by encoding name."""
+    codecs = {GzipCodec.name: GzipCodec}
+    if brotli is not None:
+        codecs[BrotliCodec.name] = BrotliCodec
+    if zstandard is not None:
+        codecs[ZstdCodec.name] = ZstdCodec
+    return codecs
+
+
+def parse_accept_encoding(header):
+    """Parse an Accept-Encoding header into a ``{coding: q}`` dict.
+
+    Malformed q-values are treated as 0 so a broken client never gets an
+    encoding it did not clearly ask for.
+    """
+    accepted = {}
+    for part in (header or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        coding, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params:
+            key, _, value = params.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate(header, preference):
+    """Pick the best encoding for an Accept-Encoding header.
+
+    Args:
+        header (str): Raw Accept-Encoding request header.
+        preference (list): Server-side encoding names, most preferred first.
+
+    Returns:
+        str or None: Chosen encoding name, or None to send identity.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name in preference:
+        q = accepted.get(name, wildcard)
+        # strict '>' keeps server preference order on ties
+        if q > best_q:
+            best, best_q = name, q
+    return best
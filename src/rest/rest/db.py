@@ -63,6 +63,11 @@ class MongoDBClient:
             self.client.close()
             logger.info("MongoDB connection closed")
 
+    def is_replica_set(self):
+        """Return True if connected to a replica set (change streams need one)."""
+        self.get_db()
+        return self.client.admin.command('ismaster').get('setName') is not None
+
     def health_check(self):
         """Check if MongoDB is healthy."""
         try:
@@ -93,6 +98,17 @@ def get_mongo_client():
     return _mongo_client
 
 
+def reset_mongo_client():
+    """Forget the client singleton so the next use opens a fresh connection pool.
+
+    Call in a newly forked worker: pymongo clients are not fork-safe and the
+    copy inherited from the parent must not be used (or closed) in the child.
+    """
+    global _mongo_client
+    _mongo_client = None
+    MongoDBClient._instance = None
+
+
 def wait_for_db(timeout: int = 30, interval: float = 1.0, timeout_seconds: int = None):
     """Block until MongoDB is available or raise TimeoutError.
 
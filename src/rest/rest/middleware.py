@@ -0,0 +1,67 @@
+"""Custom HTTP middleware."""
+import logging
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest.compression import available_codecs, negotiate
+
+logger = logging.getLogger(__name__)
+
+# Content types that must never be buffered or re-encoded.
+_SKIP_CONTENT_TYPES = ('text/event-stream',)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Negotiated response compression (zstd / brotli / gzip).
+
+    Behaves like Django's ``GZipMiddleware`` but picks the best encoding the
+    client accepts from those installed, honours a minimum body size and
+    per-encoding levels from settings, and compresses streaming responses
+    chunk by chunk.
+    """
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        codecs = available_codecs()
+        levels = getattr(settings, 'COMPRESSION_LEVELS', {})
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.codecs = {}
+        for name in getattr(settings, 'COMPRESSION_ENCODINGS', ['gzip']):
+            if name not in codecs:
+                logger.info("Compression encoding %s unavailable, skipping", name)
+                continue
+            self.codecs[name] = codecs[name](levels.get(name))
+        self.preference = list(self.codecs)
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        if response.get('Content-Type', '').startswith(_SKIP_CONTENT_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.preference)
+        if encoding is None:
+            return response
+        codec = self.codecs[encoding]
+
+        if response.streaming:
+            response.streaming_content = codec.stream(response.streaming_content)
+            # the compressed length isn't known up front
+            del response['Content-Length']
+        else:
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # a strong ETag must not be reused across different encodings
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
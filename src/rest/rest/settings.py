@@ -61,11 +61,13 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'corsheaders'
+    'corsheaders',
+    'todos',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'rest.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -111,6 +113,43 @@ MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
 MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
 MONGO_URI = os.getenv('MONGO_URI', f'mongodb://{MONGO_HOST}:{MONGO_PORT}/')
 
+# Todo storage backend: 'mongo', 'memory' (in-process, no mongod needed),
+# or a dotted path to a todos.backends.base.TodoBackend subclass.
+TODO_STORAGE_BACKEND = os.getenv('TODO_STORAGE_BACKEND', 'mongo')
+
+# Compact stored schema (todos.schema). Keep legacy field support on until
+# `manage.py migrate_todo_schema` reports nothing left to migrate.
+TODO_SCHEMA_LEGACY_FIELDS = _env_bool('TODO_SCHEMA_LEGACY_FIELDS', True)
+TODO_SCHEMA_MIGRATE_ON_READ = _env_bool('TODO_SCHEMA_MIGRATE_ON_READ', True)
+
+# Pre-rendered GET /todos/ pages (see rest.snapshots), as "page:page_size"
+# pairs; empty disables. Rebuilt after changes at most every MIN_INTERVAL
+# seconds and at least every MAX_AGE seconds.
+TODO_LIST_SNAPSHOTS = [
+    tuple(int(n) for n in v.split(':'))
+    for v in os.getenv('TODO_LIST_SNAPSHOTS', '1:10').split(',') if v.strip()
+]
+TODO_LIST_SNAPSHOT_MIN_INTERVAL = float(os.getenv('TODO_LIST_SNAPSHOT_MIN_INTERVAL', 0.5))
+TODO_LIST_SNAPSHOT_MAX_AGE = float(os.getenv('TODO_LIST_SNAPSHOT_MAX_AGE', 5))
+# Snapshots are only served when the todo change feed sees every write (a
+# Mongo replica set). Set this to also serve them with a local feed when this
+# process is the only writer: a single worker, or the memory backend.
+TODO_LIST_SNAPSHOTS_LOCAL_FEED = _env_bool('TODO_LIST_SNAPSHOTS_LOCAL_FEED', False)
+
+
+# Response compression (see rest.middleware.CompressionMiddleware)
+# Encodings in server preference order; ones whose library is not
+# installed (brotli, zstandard) are skipped at startup.
+COMPRESSION_ENCODINGS = [
+    e.strip() for e in os.getenv('COMPRESSION_ENCODINGS', 'zstd,br,gzip').split(',') if e.strip()
+]
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_LEVELS = {
+    'gzip': int(os.getenv('COMPRESSION_GZIP_LEVEL', 6)),
+    'br': int(os.getenv('COMPRESSION_BR_LEVEL', 4)),
+    'zstd': int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3)),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
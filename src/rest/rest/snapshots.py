@@ -0,0 +1,99 @@
+"""Materialized snapshots of hot list responses.
+
+A `SnapshotStore` keeps a fixed set of list views (page, page_size)
+pre-rendered as response bytes, so serving them costs no query and no
+serialization. A background thread rebuilds them:
+
+* after any change seen by this process's todo change feed, but no more
+  often than `min_interval` seconds;
+* at least every `max_age` seconds, as a backstop for missed changes.
+
+A change drops the snapshots at once, so until the rebuild lands requests
+fall back to the normal path. Writes made through this process drop them
+before the write returns; writes from other processes only once the feed
+delivers them, so the store is only safe with a feed that sees every write
+(see `rest.views.get_list_snapshots`).
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    Pre-rendered responses for a fixed set of keys, rebuilt off the request path.
+
+    Args:
+        keys (iterable): Hashable keys to keep snapshots for.
+        build (callable): ``build(key)`` returning the snapshot (e.g. bytes).
+        min_interval (float): Minimum seconds between rebuilds.
+        max_age (float): Rebuild at least this often, even without changes.
+    """
+
+    def __init__(self, keys, build, min_interval=0.5, max_age=5.0):
+        self.keys = frozenset(keys)
+        self.build = build
+        self.min_interval = min_interval
+        self.max_age = max_age
+        self._snapshots = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._thread = None
+        self._last_build = 0.0
+        self.builds = 0
+
+    def get(self, key):
+        """Return the snapshot for `key`, or None to use the normal path."""
+        if key not in self.keys:
+            return None
+        if self._thread is None:
+            self.start()
+        return self._snapshots.get(key)
+
+    def invalidate(self, *args):
+        """Drop all snapshots and schedule a rebuild (change feed listener)."""
+        with self._lock:
+            self._version += 1
+            self._snapshots = {}
+        self._dirty.set()
+
+    def start(self):
+        """Start the refresher thread (started in each worker, not before fork)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="list-snapshots", daemon=True
+            )
+            self._dirty.set()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._dirty.wait(timeout=self.max_age)
+            wait = self._last_build + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._dirty.clear()
+            try:
+                self.refresh()
+            except Exception:
+                # keep serving the normal path; retry on the next change or max_age
+                logger.exception("Error rebuilding list snapshots")
+            self._last_build = time.monotonic()
+
+    def refresh(self):
+        """Rebuild every snapshot now; discarded if a change raced the build."""
+        with self._lock:
+            version = self._version
+        built = {key: self.build(key) for key in self.keys}
+        with self._lock:
+            if self._version != version:
+                # a write landed mid-build; _dirty is set so we'll rebuild
+                return False
+            self._snapshots = built
+        self.builds += 1
+        return True
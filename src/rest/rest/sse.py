@@ -0,0 +1,117 @@
+"""Server-Sent Events endpoint for the todo change feed.
+
+Served as a plain ASGI app (see `rest.asgi`) rather than a Django view:
+each open connection is just a coroutine parked on its subscription
+queue, so idle clients cost a few KB and no thread.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from todos.events import RESET, get_change_feed
+
+EVENTS_PATH = '/todos/events/'
+# Comment line sent on idle connections so proxies don't time them out.
+HEARTBEAT_SECONDS = 15
+# Client reconnect delay advertised via the `retry:` field.
+RETRY_MS = 3000
+
+
+def _format_event(event):
+    data = {'op': event['op'], 'id': event['todo_id'], 'todo': event['todo']}
+    return (
+        f"id: {event['id']}\n"
+        f"event: {event['op']}\n"
+        f"data: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+    ).encode('utf-8')
+
+
+def _reset_event(event_id):
+    # carries the current position so the client's next reconnect resumes
+    # from here instead of sending the stale id and being reset again
+    return f"id: {event_id}\nevent: {RESET}\ndata: {{}}\n\n".encode('utf-8')
+
+
+def _cors_headers(headers):
+    origin = headers.get(b'origin', b'').decode('latin-1')
+    if not origin or origin not in getattr(settings, 'CORS_ALLOWED_ORIGINS', []):
+        return []
+    cors = [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+    if getattr(settings, 'CORS_ALLOW_CREDENTIALS', False):
+        cors.append((b'access-control-allow-credentials', b'true'))
+    return cors
+
+
+def _last_event_id(scope, headers):
+    value = headers.get(b'last-event-id')
+    if value:
+        return value.decode('latin-1')
+    # EventSource can't set headers on the first connect; allow a query param
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    return (query.get('lastEventId') or [None])[0]
+
+
+async def _watch_disconnect(receive, sub):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            sub.stop()
+            return
+
+
+async def events_application(scope, receive, send):
+    """ASGI app streaming todo change events as text/event-stream."""
+    if scope['method'] not in ('GET', 'HEAD'):
+        await send({'type': 'http.response.start', 'status': 405,
+                    'headers': [(b'allow', b'GET')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    headers = dict(scope['headers'])
+    feed = get_change_feed()
+    # first call may probe Mongo; keep it off the event loop
+    await asyncio.get_event_loop().run_in_executor(None, feed.start)
+    sub, backlog = feed.subscribe(_last_event_id(scope, headers))
+    disconnect = asyncio.ensure_future(_watch_disconnect(receive, sub))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ] + _cors_headers(headers),
+        })
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        preamble = f"retry: {RETRY_MS}\n\n".encode('utf-8')
+        if backlog is None:
+            preamble += _reset_event(sub.position)
+        elif backlog:
+            preamble += b''.join(_format_event(e) for e in backlog)
+        else:
+            # an id-only block still sets the client's Last-Event-ID, so one
+            # that drops before its first event resumes from here
+            preamble += f"id: {sub.position}\n\n".encode('utf-8')
+        await send({'type': 'http.response.body', 'body': preamble, 'more_body': True})
+
+        while not sub.stopped:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+                continue
+            if event is None or sub.stopped:
+                break
+            await send({'type': 'http.response.body', 'body': _format_event(event), 'more_body': True})
+
+        # disconnected, or dropped for falling behind (client resumes via
+        # Last-Event-ID)
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        sub.close()
+        disconnect.cancel()
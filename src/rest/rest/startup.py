@@ -0,0 +1,44 @@
+"""Process start-up helpers shared by the WSGI and ASGI entry points."""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def maybe_wait_for_db():
+    """Wait for the storage backend during process startup if enabled.
+
+    Only the Mongo backend actually waits; the in-memory one is ready
+    immediately.
+
+    Controlled by `RUN_DB_WAIT` env var (default '1'). Timeout can be
+    overridden with `DB_WAIT_TIMEOUT` (seconds). After a successful wait
+    `RUN_DB_WAIT` is set to '0' so worker processes started from this one
+    (forked or re-spawned on reload) don't probe again.
+    """
+    if os.environ.get('RUN_DB_WAIT', '1') == '0':
+        logger.debug('RUN_DB_WAIT=0, skipping DB wait')
+        return
+
+    try:
+        timeout = int(os.environ.get('DB_WAIT_TIMEOUT', '120'))
+    except ValueError:
+        timeout = 120
+
+    try:
+        # Import here so django settings are configured
+        import django
+
+        django.setup()
+        from todos.backends import get_backend
+
+        backend = get_backend()
+        logger.info('Waiting for %s storage backend (timeout=%ds)...', backend.name, timeout)
+        backend.wait_until_ready(timeout)
+        logger.info('Storage backend ready')
+    except Exception:
+        logger.exception('Failed waiting for storage backend during startup')
+        # Re-raise so the process fails fast and orchestration can handle it
+        raise
+
+    os.environ['RUN_DB_WAIT'] = '0'
@@ -14,9 +14,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.urls import path, include
-from .views import TodoListView, HealthView
+from .views import TodoListView, TodoStatsView, HealthView
 
 urlpatterns = [
     path('todos/', TodoListView.as_view(), name='signup'),
+    path('todos/stats/', TodoStatsView.as_view(), name='todo-stats'),
     path('health/', HealthView.as_view(), name='health'),
 ]
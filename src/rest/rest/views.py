@@ -1,13 +1,23 @@
 """REST API views for todos."""
 import logging
+import threading
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from todos.events import MODE_MONGO, get_change_feed
 from todos.service import TodoService
-from rest.db import get_mongo_client
+from todos.backends import get_backend
+from rest.snapshots import SnapshotStore
 
 logger = logging.getLogger(__name__)
 
+_list_snapshots = None
+_list_snapshots_ready = False
+_list_snapshots_lock = threading.Lock()
+
 
 def _int_param(request, name, default):
     value = request.query_params.get(name)
@@ -20,6 +30,61 @@ def _int_param(request, name, default):
     return max(n, 1)
 
 
+def _list_payload(page, page_size):
+    result = TodoService.list_todos(page=page, page_size=page_size)
+    return {
+        'results': result['todos'],
+        'page': result['page'],
+        'page_size': result['page_size'],
+        'total': result['total'],
+        'total_pages': result['total_pages'],
+    }
+
+
+def _render_list_snapshot(key):
+    page, page_size = key
+    return JSONRenderer().render(_list_payload(page, page_size))
+
+
+def _create_list_snapshots():
+    keys = getattr(settings, 'TODO_LIST_SNAPSHOTS', [])
+    if not keys:
+        return None
+    feed = get_change_feed()
+    feed.start()
+    # a local feed only hears this process's writes; other workers' writes
+    # would leave the snapshots stale
+    if feed.mode != MODE_MONGO and not getattr(settings, 'TODO_LIST_SNAPSHOTS_LOCAL_FEED', False):
+        logger.info("List snapshots disabled: change feed is local to this process")
+        return None
+    store = SnapshotStore(
+        keys,
+        _render_list_snapshot,
+        min_interval=settings.TODO_LIST_SNAPSHOT_MIN_INTERVAL,
+        max_age=settings.TODO_LIST_SNAPSHOT_MAX_AGE,
+    )
+    feed.add_listener(store.invalidate)
+    store.start()
+    return store
+
+
+def get_list_snapshots():
+    """Return the process's list snapshot store, or None if disabled."""
+    global _list_snapshots, _list_snapshots_ready
+    if not _list_snapshots_ready:
+        with _list_snapshots_lock:
+            if not _list_snapshots_ready:
+                _list_snapshots = _create_list_snapshots()
+                # a failed feed probe leaves the mode unknown; decide again
+                # on a later request
+                _list_snapshots_ready = (
+                    _list_snapshots is not None
+                    or not getattr(settings, 'TODO_LIST_SNAPSHOTS', [])
+                    or get_change_feed().mode is not None
+                )
+    return _list_snapshots
+
+
 class TodoListView(APIView):
 
     def get(self, request):
@@ -27,15 +92,14 @@ class TodoListView(APIView):
             page = _int_param(request, 'page', 1)
             page_size = _int_param(request, 'page_size', 10)
 
-            result = TodoService.list_todos(page=page, page_size=page_size)
-            
-            return Response({
-                'results': result['todos'],
-                'page': result['page'],
-                'page_size': result['page_size'],
-                'total': result['total'],
-                'total_pages': result['total_pages'],
-            }, status=status.HTTP_200_OK)
+            # hot pages are served pre-rendered (JSON clients only)
+            snapshots = get_list_snapshots()
+            if snapshots is not None and request.accepted_renderer.format == 'json':
+                body = snapshots.get((page, page_size))
+                if body is not None:
+                    return HttpResponse(body, content_type='application/json')
+
+            return Response(_list_payload(page, page_size), status=status.HTTP_200_OK)
         except Exception as e:
             logger.exception("Error fetching todos")
             return Response(
@@ -64,14 +128,27 @@ class TodoListView(APIView):
             )
 
 
+class TodoStatsView(APIView):
+    """Dashboard counters served from the stats rollup."""
+
+    def get(self, request):
+        try:
+            return Response(TodoService.get_stats(), status=status.HTTP_200_OK)
+        except Exception:
+            logger.exception("Error fetching todo stats")
+            return Response(
+                {"error": "Unable to fetch todo stats"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class HealthView(APIView):
     """Health check endpoint for monitoring."""
 
     def get(self, request):
         """Check if service is healthy."""
         try:
-            mongo_client = get_mongo_client()
-            if mongo_client.health_check():
+            if get_backend().health_check():
                 return Response({'status': 'ok'}, status=status.HTTP_200_OK)
             else:
                 return Response(
@@ -0,0 +1,43 @@
+"""Pluggable storage backends for todos.
+
+The active backend is chosen by ``settings.TODO_STORAGE_BACKEND``: either
+an alias from `BACKENDS` or a dotted path to a `TodoBackend` subclass.
+"""
+import threading
+from django.conf import settings
+from django.utils.module_loading import import_string
+from todos.backends.base import DAY_FORMAT, TodoBackend
+
+BACKENDS = {
+    "mongo": "todos.backends.mongo.MongoBackend",
+    "memory": "todos.backends.memory.MemoryBackend",
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def load_backend(name):
+    """Instantiate a backend from an alias or dotted class path."""
+    return import_string(BACKENDS.get(name, name))()
+
+
+def get_backend():
+    """Return this process's storage backend singleton."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = load_backend(getattr(settings, "TODO_STORAGE_BACKEND", "mongo"))
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the process's storage backend (e.g. in benchmarks); return the old one."""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    return previous
+
+
+__all__ = ["BACKENDS", "DAY_FORMAT", "TodoBackend", "get_backend", "load_backend", "set_backend"]
@@ -0,0 +1,113 @@
+"""Storage backend interface for todos."""
+
+DAY_FORMAT = "%Y-%m-%d"
+
+
+class TodoBackend:
+    """
+    Storage operations `TodoDAO` and `TodoStatsDAO` are built on.
+
+    Documents are plain dicts keyed like MongoDB documents (``_id`` is a
+    ``bson.ObjectId``). Backends return fresh dicts that callers may mutate.
+    Filters use the MongoDB query subset the DAO relies on.
+    """
+
+    name = None
+
+    # --- todos ---
+
+    def insert(self, doc):
+        """Insert a todo; return the stored document including ``_id``."""
+        raise NotImplementedError
+
+    def insert_many(self, docs):
+        """
+        Insert several todos, unordered; return their ids in input order.
+
+        A document whose ``_id`` already exists (stored, or earlier in the
+        batch) is skipped and the rest are still inserted; then
+        ``pymongo.errors.BulkWriteError`` is raised with the skipped
+        indexes in ``details["writeErrors"]``.
+        """
+        raise NotImplementedError
+
+    def find(self, filter_dict, skip=0, limit=0):
+        """Return matching todos in index order, paged by skip/limit (0 = no limit)."""
+        raise NotImplementedError
+
+    def count(self, filter_dict):
+        """Return the number of matching todos."""
+        raise NotImplementedError
+
+    def get(self, todo_id):
+        """Return the todo with this ObjectId, or None."""
+        raise NotImplementedError
+
+    def update(self, todo_id, fields):
+        """Set `fields` on a todo; return (previous, updated), or (None, None)."""
+        raise NotImplementedError
+
+    def delete(self, todo_id):
+        """Delete a todo; return the removed document, or None."""
+        raise NotImplementedError
+
+    def delete_many(self, todo_ids):
+        """Delete several todos by id; return how many were removed."""
+        raise NotImplementedError
+
+    def ensure_indexes(self):
+        """Create or verify the indexes the queries rely on."""
+
+    # --- stats rollup ---
+
+    def increment_stats(self, total=0, completed=0, day=None, created=0):
+        """Atomically add deltas to the stats rollup (`day` is a DAY_FORMAT key)."""
+        raise NotImplementedError
+
+    def get_stats(self):
+        """Return the stats rollup, or None if it was never written."""
+        raise NotImplementedError
+
+    def rebuild_stats(self):
+        """Recompute and store the stats rollup from the todos; return it."""
+        raise NotImplementedError
+
+    # --- schema migrations ---
+
+    def count_unmigrated(self):
+        """Return how many stored todos are below the current schema version."""
+        return 0
+
+    def migrate_schema_batch(self, after_id=None, batch_size=500):
+        """
+        Upgrade the next batch of stored todos to the current schema.
+
+        Args:
+            after_id: Resume after this _id (None to start at the beginning).
+            batch_size (int): Maximum documents to upgrade.
+
+        Returns:
+            tuple: (migrated_count, last_id); last_id is None when done.
+        """
+        return 0, None
+
+    def storage_stats(self):
+        """Return size figures for the stored todos (backend specific)."""
+        return {}
+
+    # --- change feed / lifecycle ---
+
+    def supports_change_streams(self):
+        """Return True if `watch` can be used."""
+        return False
+
+    def watch(self, resume_after=None):
+        """Return a change-stream iterator over todo changes."""
+        raise NotImplementedError(f"{self.name} backend has no change streams")
+
+    def wait_until_ready(self, timeout):
+        """Block until the backend can serve requests (or raise TimeoutError)."""
+
+    def health_check(self):
+        """Return True if the backend is usable."""
+        return True
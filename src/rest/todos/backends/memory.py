@@ -0,0 +1,361 @@
+"""In-process storage backend with sorted and inverted indexes.
+
+Meant for benchmarks, CI and local development without a mongod. Data
+lives only as long as the process. Indexes mirror what MongoDB keeps for
+this collection:
+
+* ``_id``: sorted list of ObjectIds (natural/insertion order);
+* ``created_at``: sorted list of ``(created_at, _id)`` used for range filters;
+* ``text``: inverted index token -> ids for ``$text`` queries.
+
+Filters support equality, ``$eq/$ne/$in/$nin/$gt/$gte/$lt/$lte`` on top-level
+fields and ``{"$text": {"$search": ...}}``. ``$text`` matches documents
+containing any of the search words (case-insensitive, no stemming).
+"""
+import heapq
+import operator
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from todos.backends.base import DAY_FORMAT, TodoBackend
+
+_TOKEN_RE = re.compile(r"\w+")
+# MongoDB's duplicate key error code
+_DUPLICATE_KEY = 11000
+_MIN_ID = ObjectId(b"\x00" * 12)
+_MAX_ID = ObjectId(b"\xff" * 12)
+
+_COMPARISONS = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+_RANGE_OPS = {"$gt", "$gte", "$lt", "$lte"}
+
+
+def _tokens(text):
+    if not isinstance(text, str):
+        return set()
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _is_operator_dict(cond):
+    return isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond)
+
+
+def _match_value(value, cond):
+    if not _is_operator_dict(cond):
+        return value == cond
+    for op, arg in cond.items():
+        if op == "$in":
+            ok = value in arg
+        elif op == "$nin":
+            ok = value not in arg
+        elif op in _COMPARISONS:
+            if op in _RANGE_OPS and value is None:
+                return False
+            try:
+                ok = _COMPARISONS[op](value, arg)
+            except TypeError:
+                # Mongo never matches a range across types
+                return False
+        else:
+            raise ValueError(f"Unsupported query operator {op}")
+        if not ok:
+            return False
+    return True
+
+
+def _matches(doc, filter_dict):
+    for field, cond in filter_dict.items():
+        if field.startswith("$"):
+            raise ValueError(f"Unsupported query operator {field}")
+        if not _match_value(doc.get(field), cond):
+            return False
+    return True
+
+
+class _IndexRange:
+    """Lazy view of the ids in ``entries[lo:hi]`` of a ``(key, _id)`` index."""
+
+    def __init__(self, entries, lo, hi):
+        self.entries = entries
+        self.lo = lo
+        self.hi = max(lo, hi)
+
+    def __len__(self):
+        return self.hi - self.lo
+
+    def __iter__(self):
+        entries = self.entries
+        return (entries[i][1] for i in range(self.lo, self.hi))
+
+    def __getitem__(self, s):
+        start, stop, _ = s.indices(len(self))
+        return [oid for _, oid in self.entries[self.lo + start:self.lo + stop]]
+
+
+class MemoryBackend(TodoBackend):
+    """Thread-safe in-memory todo store."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs = {}
+        self._ids = []
+        self._by_created = []
+        self._text = {}
+        self._stats = None
+
+    # --- indexing ---
+
+    def _index(self, doc):
+        oid = doc["_id"]
+        self._docs[oid] = doc
+        if not self._ids or oid > self._ids[-1]:
+            self._ids.append(oid)
+        else:
+            insort(self._ids, oid)
+        created = doc.get("created_at")
+        if isinstance(created, datetime):
+            insort(self._by_created, (created, oid))
+        for token in _tokens(doc.get("text")):
+            self._text.setdefault(token, set()).add(oid)
+
+    def _unindex_secondary(self, doc):
+        oid = doc["_id"]
+        created = doc.get("created_at")
+        if isinstance(created, datetime):
+            i = bisect_left(self._by_created, (created, oid))
+            del self._by_created[i]
+        for token in _tokens(doc.get("text")):
+            postings = self._text[token]
+            postings.discard(oid)
+            if not postings:
+                del self._text[token]
+
+    def _unindex(self, doc):
+        self._unindex_secondary(doc)
+        oid = doc["_id"]
+        del self._ids[bisect_left(self._ids, oid)]
+        del self._docs[oid]
+
+    def _created_range(self, cond):
+        lo, hi = 0, len(self._by_created)
+        for op, value in cond.items():
+            if not isinstance(value, datetime):
+                raise ValueError("created_at ranges must compare against datetimes")
+            if op == "$gte":
+                lo = max(lo, bisect_left(self._by_created, (value, _MIN_ID)))
+            elif op == "$gt":
+                lo = max(lo, bisect_right(self._by_created, (value, _MAX_ID)))
+            elif op == "$lt":
+                hi = min(hi, bisect_left(self._by_created, (value, _MIN_ID)))
+            elif op == "$lte":
+                hi = min(hi, bisect_right(self._by_created, (value, _MAX_ID)))
+        return _IndexRange(self._by_created, lo, hi)
+
+    def _plan(self, filter_dict):
+        """
+        Choose the index to scan for `filter_dict`.
+
+        Returns:
+            tuple: (ids, residual) - candidate ids (a sequence in result
+            order, or an unordered set for ``$text``) and the predicates
+            still to check on each document.
+        """
+        residual = dict(filter_dict or {})
+        text = residual.pop("$text", None)
+        oid = residual.get("_id")
+        if oid is not None and not _is_operator_dict(oid):
+            del residual["_id"]
+            return ([oid] if oid in self._docs else []), residual
+        if text is not None:
+            ids = set()
+            for token in _tokens(text.get("$search", "")):
+                ids |= self._text.get(token, set())
+            return ids, residual
+        created = residual.get("created_at")
+        if _is_operator_dict(created) and set(created) <= _RANGE_OPS:
+            del residual["created_at"]
+            return self._created_range(created), residual
+        return self._ids, residual
+
+    # --- todos ---
+
+    def insert(self, doc):
+        doc = dict(doc)
+        doc.setdefault("_id", ObjectId())
+        with self._lock:
+            if doc["_id"] in self._docs:
+                raise DuplicateKeyError(f"Duplicate _id {doc['_id']}")
+            self._index(doc)
+            return dict(doc)
+
+    def insert_many(self, docs):
+        docs = [dict(doc) for doc in docs]
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        errors = []
+        with self._lock:
+            for i, doc in enumerate(docs):
+                oid = doc["_id"]
+                if oid in self._docs:
+                    # unordered like MongoDB: skip the duplicate, keep going
+                    errors.append({
+                        "index": i,
+                        "code": _DUPLICATE_KEY,
+                        "errmsg": f"E11000 duplicate key error: _id {oid}",
+                        "op": doc,
+                    })
+                    continue
+                self._docs[oid] = doc
+                self._ids.append(oid)
+                created = doc.get("created_at")
+                if isinstance(created, datetime):
+                    self._by_created.append((created, oid))
+                for token in _tokens(doc.get("text")):
+                    self._text.setdefault(token, set()).add(oid)
+            # near-sorted input, so timsort is close to linear
+            self._ids.sort()
+            self._by_created.sort()
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors,
+                "writeConcernErrors": [],
+                "nInserted": len(docs) - len(errors),
+                "nUpserted": 0,
+                "nMatched": 0,
+                "nModified": 0,
+                "nRemoved": 0,
+                "upserted": [],
+            })
+        return [doc["_id"] for doc in docs]
+
+    def find(self, filter_dict, skip=0, limit=0):
+        with self._lock:
+            ids, residual = self._plan(filter_dict)
+            stop = skip + limit if limit else None
+            if isinstance(ids, set):
+                # only order as much of the set as the page needs
+                if residual or stop is None:
+                    ids = sorted(ids)
+                else:
+                    ids = heapq.nsmallest(stop, ids)
+            if residual:
+                selected = []
+                seen = 0
+                for oid in ids:
+                    if not _matches(self._docs[oid], residual):
+                        continue
+                    if seen >= skip:
+                        selected.append(oid)
+                        if stop is not None and seen + 1 >= stop:
+                            break
+                    seen += 1
+            else:
+                selected = ids[skip:stop]
+            return [dict(self._docs[oid]) for oid in selected]
+
+    def count(self, filter_dict):
+        with self._lock:
+            ids, residual = self._plan(filter_dict)
+            if not residual:
+                return len(ids)
+            docs = self._docs
+            return sum(1 for oid in ids if _matches(docs[oid], residual))
+
+    def get(self, todo_id):
+        with self._lock:
+            doc = self._docs.get(todo_id)
+            return dict(doc) if doc is not None else None
+
+    def update(self, todo_id, fields):
+        if "_id" in fields:
+            raise ValueError("_id is immutable")
+        with self._lock:
+            doc = self._docs.get(todo_id)
+            if doc is None:
+                return None, None
+            previous = dict(doc)
+            if "text" in fields or "created_at" in fields:
+                self._unindex_secondary(doc)
+                doc.update(fields)
+                created = doc.get("created_at")
+                if isinstance(created, datetime):
+                    insort(self._by_created, (created, todo_id))
+                for token in _tokens(doc.get("text")):
+                    self._text.setdefault(token, set()).add(todo_id)
+            else:
+                doc.update(fields)
+            return previous, dict(doc)
+
+    def delete(self, todo_id):
+        with self._lock:
+            doc = self._docs.get(todo_id)
+            if doc is None:
+                return None
+            self._unindex(doc)
+            return dict(doc)
+
+    def delete_many(self, todo_ids):
+        with self._lock:
+            removed = set()
+            for oid in todo_ids:
+                doc = self._docs.pop(oid, None)
+                if doc is None:
+                    continue
+                removed.add(oid)
+                for token in _tokens(doc.get("text")):
+                    postings = self._text[token]
+                    postings.discard(oid)
+                    if not postings:
+                        del self._text[token]
+            if removed:
+                # one linear rebuild beats many list deletions
+                self._ids = [oid for oid in self._ids if oid not in removed]
+                self._by_created = [e for e in self._by_created if e[1] not in removed]
+            return len(removed)
+
+    # --- stats rollup ---
+
+    def increment_stats(self, total=0, completed=0, day=None, created=0):
+        with self._lock:
+            if self._stats is None:
+                self._stats = {"total": 0, "completed": 0, "created_by_day": {}}
+            self._stats["total"] += total
+            self._stats["completed"] += completed
+            if day is not None and created:
+                by_day = self._stats["created_by_day"]
+                by_day[day] = by_day.get(day, 0) + created
+
+    def get_stats(self):
+        with self._lock:
+            if self._stats is None:
+                return None
+            return dict(self._stats, created_by_day=dict(self._stats["created_by_day"]))
+
+    def rebuild_stats(self):
+        with self._lock:
+            by_day = {}
+            completed = 0
+            for doc in self._docs.values():
+                if doc.get("completed") is True:
+                    completed += 1
+                created = doc.get("created_at")
+                if isinstance(created, datetime):
+                    day = created.strftime(DAY_FORMAT)
+                    by_day[day] = by_day.get(day, 0) + 1
+            self._stats = {
+                "total": len(self._docs),
+                "completed": completed,
+                "created_by_day": by_day,
+            }
+            return self.get_stats()
@@ -0,0 +1,250 @@
+"""MongoDB storage backend (pymongo)."""
+import logging
+from django.conf import settings
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+from rest.db import get_db, get_mongo_client, wait_for_db
+from todos import schema
+from todos.backends.base import DAY_FORMAT, TodoBackend
+
+logger = logging.getLogger(__name__)
+
+TODOS_COLLECTION = "todos"
+TODO_STATS_COLLECTION = "todo_stats"
+TODO_STATS_ID = "todos"
+TEXT_INDEX = "todo_text"
+# text index created before the compact schema; Mongo allows only one
+LEGACY_TEXT_INDEX = "text_text"
+
+
+class _DecodedChangeStream:
+    """Wraps a pymongo ChangeStream, decoding each fullDocument to API shape."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stream.close()
+
+    def __iter__(self):
+        for change in self._stream:
+            if change.get("fullDocument") is not None:
+                change["fullDocument"] = schema.decode(change["fullDocument"])
+            yield change
+
+    @property
+    def resume_token(self):
+        return self._stream.resume_token
+
+
+class MongoBackend(TodoBackend):
+    """
+    Stores todos in a collection of the shared MongoDB client.
+
+    Documents are stored in the compact form defined by `todos.schema`.
+
+    Args:
+        collection (str): Todos collection name.
+        stats_collection (str): Stats rollup collection name.
+        legacy_fields (bool): Also match/read pre-migration field names.
+            Defaults to settings.TODO_SCHEMA_LEGACY_FIELDS.
+        migrate_on_read (bool): Upgrade legacy documents as they are read.
+            Defaults to settings.TODO_SCHEMA_MIGRATE_ON_READ.
+    """
+
+    name = "mongo"
+
+    def __init__(self, collection=TODOS_COLLECTION, stats_collection=TODO_STATS_COLLECTION,
+                 legacy_fields=None, migrate_on_read=None):
+        self.collection_name = collection
+        self.stats_collection_name = stats_collection
+        if legacy_fields is None:
+            legacy_fields = getattr(settings, "TODO_SCHEMA_LEGACY_FIELDS", True)
+        if migrate_on_read is None:
+            migrate_on_read = getattr(settings, "TODO_SCHEMA_MIGRATE_ON_READ", True)
+        self.legacy_fields = legacy_fields
+        self.migrate_on_read = migrate_on_read and legacy_fields
+
+    def get_collection(self):
+
+        db = get_db()
+        return db[self.collection_name]
+
+    def get_stats_collection(self):
+
+        db = get_db()
+        return db[self.stats_collection_name]
+
+    def _filter(self, filter_dict):
+        return schema.translate_filter(filter_dict, legacy=self.legacy_fields)
+
+    def _decode_all(self, docs):
+        """Decode read documents, upgrading any legacy ones in place."""
+        if self.migrate_on_read:
+            legacy_ids = [doc["_id"] for doc in docs if schema.needs_migration(doc)]
+            if legacy_ids:
+                try:
+                    self._migrate_ids(legacy_ids)
+                except Exception as e:
+                    # reads must not fail because of a best-effort upgrade
+                    logger.warning(f"Error migrating todos on read: {e}")
+        return [schema.decode(doc) for doc in docs]
+
+    def _migrate_ids(self, todo_ids):
+        query = dict(schema.UNMIGRATED, _id={"$in": list(todo_ids)})
+        result = self.get_collection().update_many(query, schema.migration_pipeline())
+        return result.modified_count
+
+    def insert(self, doc):
+        collection = self.get_collection()
+        result = collection.insert_one(schema.encode(doc))
+        # Fetch the created document from DB to ensure clean JSON-serializable data
+        return schema.decode(collection.find_one({"_id": result.inserted_id}))
+
+    def insert_many(self, docs):
+        result = self.get_collection().insert_many(
+            [schema.encode(doc) for doc in docs], ordered=False
+        )
+        return result.inserted_ids
+
+    def find(self, filter_dict, skip=0, limit=0):
+        cursor = self.get_collection().find(self._filter(filter_dict)).skip(skip).limit(limit)
+        return self._decode_all(list(cursor))
+
+    def count(self, filter_dict):
+        return self.get_collection().count_documents(self._filter(filter_dict))
+
+    def get(self, todo_id):
+        doc = self.get_collection().find_one({"_id": todo_id})
+        return self._decode_all([doc])[0] if doc else None
+
+    def update(self, todo_id, fields):
+        previous = self.get_collection().find_one_and_update(
+            {"_id": todo_id},
+            schema.encode_update(fields),
+            return_document=ReturnDocument.BEFORE,
+        )
+        if not previous:
+            return None, None
+        previous = schema.decode(previous)
+        return previous, dict(previous, **fields)
+
+    def delete(self, todo_id):
+        return schema.decode(self.get_collection().find_one_and_delete({"_id": todo_id}))
+
+    def delete_many(self, todo_ids):
+        result = self.get_collection().delete_many({"_id": {"$in": list(todo_ids)}})
+        return result.deleted_count
+
+    def ensure_indexes(self):
+        collection = self.get_collection()
+        # Index on created_at for sorting
+        collection.create_index(schema.FIELDS["created_at"])
+        if self.legacy_fields:
+            collection.create_index("created_at")
+        # Text index for full-text search; covers the legacy field name too
+        # so unmigrated documents stay searchable
+        if LEGACY_TEXT_INDEX in collection.index_information():
+            collection.drop_index(LEGACY_TEXT_INDEX)
+        collection.create_index(
+            [(schema.FIELDS["text"], "text"), ("text", "text")], name=TEXT_INDEX
+        )
+
+    def drop_legacy_indexes(self):
+        """Drop indexes on legacy field names once migration is complete."""
+        collection = self.get_collection()
+        if "created_at_1" in collection.index_information():
+            collection.drop_index("created_at_1")
+
+    def increment_stats(self, total=0, completed=0, day=None, created=0):
+        inc = {}
+        if total:
+            inc["total"] = total
+        if completed:
+            inc["completed"] = completed
+        if day is not None and created:
+            inc[f"created_by_day.{day}"] = created
+        if not inc:
+            return
+        self.get_stats_collection().update_one(
+            {"_id": TODO_STATS_ID}, {"$inc": inc}, upsert=True
+        )
+
+    def get_stats(self):
+        return self.get_stats_collection().find_one({"_id": TODO_STATS_ID}, {"_id": 0})
+
+    def rebuild_stats(self):
+        # one pass over the collection for all counters
+        created_at = schema.field_expr("created_at", self.legacy_fields)
+        pipeline = [
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "completed": [{"$match": self._filter({"completed": True})}, {"$count": "n"}],
+                "created_by_day": [
+                    {"$group": {
+                        "_id": {"$dateToString": {"format": DAY_FORMAT, "date": created_at}},
+                        "n": {"$sum": 1},
+                    }},
+                ],
+            }},
+        ]
+        facets = next(self.get_collection().aggregate(pipeline))
+        stats = {
+            "total": facets["total"][0]["n"] if facets["total"] else 0,
+            "completed": facets["completed"][0]["n"] if facets["completed"] else 0,
+            "created_by_day": {
+                row["_id"]: row["n"] for row in facets["created_by_day"] if row["_id"]
+            },
+        }
+        self.get_stats_collection().replace_one({"_id": TODO_STATS_ID}, stats, upsert=True)
+        return stats
+
+    def count_unmigrated(self):
+        return self.get_collection().count_documents(schema.UNMIGRATED)
+
+    def migrate_schema_batch(self, after_id=None, batch_size=500):
+        # walk the _id index so each batch is a short range scan
+        query = dict(schema.UNMIGRATED)
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        cursor = self.get_collection().find(query, {"_id": 1}).sort("_id", 1).limit(batch_size)
+        ids = [doc["_id"] for doc in cursor]
+        if not ids:
+            return 0, None
+        return self._migrate_ids(ids), ids[-1]
+
+    def storage_stats(self):
+        try:
+            stats = get_db().command("collStats", self.collection_name)
+        except OperationFailure as e:
+            logger.warning(f"collStats failed for {self.collection_name}: {e}")
+            return {}
+        return {
+            "count": stats.get("count", 0),
+            "size": stats.get("size", 0),
+            "avg_obj_size": stats.get("avgObjSize", 0),
+            "storage_size": stats.get("storageSize", 0),
+            "total_index_size": stats.get("totalIndexSize", 0),
+            "index_sizes": stats.get("indexSizes", {}),
+        }
+
+    def supports_change_streams(self):
+        return get_mongo_client().is_replica_set()
+
+    def watch(self, resume_after=None):
+        # schema migrations rewrite every document; they aren't changes clients care about
+        stream = self.get_collection().watch(
+            [schema.SKIP_MIGRATION_CHANGES],
+            full_document="updateLookup",
+            resume_after=resume_after,
+        )
+        return _DecodedChangeStream(stream)
+
+    def wait_until_ready(self, timeout):
+        wait_for_db(timeout_seconds=timeout)
+
+    def health_check(self):
+        return get_mongo_client().health_check()
@@ -1,12 +1,10 @@
 """Data Access Object (DAO) for todos."""
 import logging
 from bson import ObjectId
-from rest.db import get_db
+from todos.backends import DAY_FORMAT, get_backend
 
 logger = logging.getLogger(__name__)
 
-TODOS_COLLECTION = "todos"
-
 
 def _id_to_str(doc):
     """Convert MongoDB _id to string representation and remove _id field."""
@@ -19,10 +17,9 @@ class TodoDAO:
     """Data Access Object for todos collection."""
 
     @staticmethod
-    def get_collection():
+    def get_backend():
     
-        db = get_db()
-        return db[TODOS_COLLECTION]
+        return get_backend()
 
     @staticmethod
     def create_todo(todo_data):
@@ -35,23 +32,19 @@ class TodoDAO:
         Returns:
             dict: Created todo with id field (string representation of _id).
         """
-        collection = TodoDAO.get_collection()
-        result = collection.insert_one(todo_data)
-        # Fetch the created document from DB to ensure clean JSON-serializable data
-        doc = collection.find_one({"_id": result.inserted_id})
+        doc = TodoDAO.get_backend().insert(todo_data)
         return _id_to_str(doc)
 
     @staticmethod
     def get_todos(page=1, page_size=10, filter_dict=None):
   
-        collection = TodoDAO.get_collection()
+        backend = TodoDAO.get_backend()
         filter_dict = filter_dict or {}
         
-        total = collection.count_documents(filter_dict)
+        total = backend.count(filter_dict)
         skip = (page - 1) * page_size
         
-        cursor = collection.find(filter_dict).skip(skip).limit(page_size)
-        todos = [_id_to_str(doc) for doc in cursor]
+        todos = [_id_to_str(doc) for doc in backend.find(filter_dict, skip=skip, limit=page_size)]
         
         return todos, total
 
@@ -59,8 +52,7 @@ class TodoDAO:
     def get_todo_by_id(todo_id):
 
         try:
-            collection = TodoDAO.get_collection()
-            doc = collection.find_one({"_id": ObjectId(todo_id)})
+            doc = TodoDAO.get_backend().get(ObjectId(todo_id))
             return _id_to_str(doc) if doc else None
         except Exception as e:
             logger.warning(f"Error retrieving todo {todo_id}: {e}")
@@ -69,45 +61,128 @@ class TodoDAO:
     @staticmethod
     def update_todo(todo_id, update_data):
 
+        _, todo = TodoDAO.update_todo_with_previous(todo_id, update_data)
+        return todo
+
+    @staticmethod
+    def update_todo_with_previous(todo_id, update_data):
+        """
+        Update a todo and also return its state before the update.
+
+        Args:
+            todo_id (str): Todo id.
+            update_data (dict): Fields to $set.
+
+        Returns:
+            tuple: (previous, updated) dicts, or (None, None) if not found.
+        """
         try:
-            collection = TodoDAO.get_collection()
-            result = collection.find_one_and_update(
-                {"_id": ObjectId(todo_id)},
-                {"$set": update_data},
-                return_document=True,
-            )
-            return _id_to_str(result) if result else None
+            previous, updated = TodoDAO.get_backend().update(ObjectId(todo_id), update_data)
+            if not previous:
+                return None, None
+            return _id_to_str(previous), _id_to_str(updated)
         except Exception as e:
             logger.warning(f"Error updating todo {todo_id}: {e}")
-            return None
+            return None, None
 
     @staticmethod
     def delete_todo(todo_id):
  
+        return TodoDAO.pop_todo(todo_id) is not None
+
+    @staticmethod
+    def pop_todo(todo_id):
+        """Delete a todo and return the removed document (None if not found)."""
         try:
-            collection = TodoDAO.get_collection()
-            result = collection.delete_one({"_id": ObjectId(todo_id)})
-            return result.deleted_count > 0
+            doc = TodoDAO.get_backend().delete(ObjectId(todo_id))
+            return _id_to_str(doc) if doc else None
         except Exception as e:
             logger.warning(f"Error deleting todo {todo_id}: {e}")
-            return False
+            return None
 
     @staticmethod
     def count_todos(filter_dict=None):
 
-        collection = TodoDAO.get_collection()
         filter_dict = filter_dict or {}
-        return collection.count_documents(filter_dict)
+        return TodoDAO.get_backend().count(filter_dict)
+
+    @staticmethod
+    def supports_change_streams():
+        """Return True if the backend can stream changes (`watch_changes`)."""
+        return TodoDAO.get_backend().supports_change_streams()
+
+    @staticmethod
+    def watch_changes(resume_after=None):
+        """
+        Open a change stream on the todos collection.
+
+        Only available when `supports_change_streams()` (a Mongo replica
+        set). Updates carry the post-update document.
+
+        Args:
+            resume_after (dict or None): Resume token to continue from.
+
+        Returns:
+            pymongo ChangeStream iterator.
+        """
+        return TodoDAO.get_backend().watch(resume_after=resume_after)
 
     @staticmethod
     def ensure_indexes():
         """Create indexes for optimal query performance."""
-        collection = TodoDAO.get_collection()
         try:
-            # Index on created_at for sorting
-            collection.create_index("created_at")
-            # Text index on text field for future full-text search
-            collection.create_index([("text", "text")])
+            TodoDAO.get_backend().ensure_indexes()
             logger.info("Indexes created/verified successfully")
         except Exception as e:
             logger.warning(f"Error creating indexes: {e}")
+
+
+class TodoStatsDAO:
+    """Data Access Object for the todo stats rollup.
+
+    All counters live in a single document so every change is one atomic
+    ``$inc`` and a dashboard read is a single ``find_one``::
+
+        {"_id": "todos", "total": 12, "completed": 5,
+         "created_by_day": {"2024-01-01": 7, "2024-01-02": 5}}
+
+    ``created_by_day`` counts existing todos by their creation day (UTC), so
+    deletes decrement it too and a rebuild reproduces the same numbers.
+    """
+
+    @staticmethod
+    def increment(total=0, completed=0, day=None, created=0):
+        """
+        Atomically apply counter deltas to the rollup document.
+
+        Args:
+            total (int): Delta for the total todo count.
+            completed (int): Delta for the completed todo count.
+            day (datetime or None): Creation time whose day bucket to adjust.
+            created (int): Delta for that day's bucket.
+        """
+        get_backend().increment_stats(
+            total=total,
+            completed=completed,
+            day=day.strftime(DAY_FORMAT) if day is not None else None,
+            created=created,
+        )
+
+    @staticmethod
+    def get_stats():
+        """Return the rollup document (without _id), or None if never built."""
+        return get_backend().get_stats()
+
+    @staticmethod
+    def rebuild():
+        """
+        Recompute the rollup from the todos collection in one pass
+        (a single ``$facet`` aggregation on Mongo).
+
+        Writes racing with a rebuild may be lost from the counters; run it
+        during quiet periods or re-run it afterwards.
+
+        Returns:
+            dict: The rebuilt stats document (without _id).
+        """
+        return get_backend().rebuild_stats()
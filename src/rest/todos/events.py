@@ -0,0 +1,270 @@
+"""Per-process change feed for todos.
+
+One `ChangeFeed` per process fans insert/update/delete events out to any
+number of subscribers (e.g. SSE connections). Events come from a single
+source:
+
+* a MongoDB change stream watched by one background thread, when the
+  storage backend supports it (Mongo replica set), so writes made by any
+  process are seen;
+* otherwise a local in-process bus fed by `TodoService`, which only sees
+  writes handled by this same process.
+
+Recent events are kept in a bounded buffer so reconnecting clients can
+resume from their `Last-Event-ID`.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pymongo.errors import OperationFailure, PyMongoError
+from todos.dao import TodoDAO
+
+logger = logging.getLogger(__name__)
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+# Tells clients their position was lost and they should refetch.
+RESET = "reset"
+
+MODE_MONGO = "mongo"
+MODE_LOCAL = "local"
+
+BUFFER_SIZE = 1000
+SUBSCRIBER_QUEUE_SIZE = 100
+# After a failed replica set probe, run locally and probe again after this.
+PROBE_RETRY_SECONDS = 5
+# ChangeStreamHistoryLost: resume token fell off the oplog.
+_HISTORY_LOST = 286
+
+_OPERATION_TYPES = {
+    "insert": INSERT,
+    "update": UPDATE,
+    "replace": UPDATE,
+    "delete": DELETE,
+}
+
+
+class Subscription:
+    """A subscriber's view of the feed, consumed on its own event loop."""
+
+    def __init__(self, feed, loop, queue):
+        self.feed = feed
+        self.loop = loop
+        self.queue = queue
+        # id of the newest event this subscriber is caught up to when it
+        # subscribed; sent with a reset so the client resumes from here
+        self.position = None
+        # set when the subscriber fell too far behind or went away
+        self.stopped = False
+
+    def stop(self):
+        """Wake the consumer and tell it to finish."""
+        self.stopped = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # consumer checks `stopped` after every item
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """Fans todo change events out from one shared source to subscribers."""
+
+    def __init__(self, buffer_size=BUFFER_SIZE, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.mode = None
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = {}  # loop -> set of Subscription
+        self._listeners = []
+        # local ids are "<epoch>-<n>" so ids from a previous process never match
+        self._epoch = os.urandom(4).hex()
+        self._counter = 0
+        # position before this process's first event, valid until the
+        # buffer starts dropping events
+        self._origin_id = f"{self._epoch}-0"
+        self._evicted = False
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._probe_failed_at = None
+
+    def _resolve_mode(self):
+        """Return the active source; MODE_LOCAL until a failed probe is retried."""
+        if self.mode is not None:
+            return self.mode
+        failed_at = self._probe_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < PROBE_RETRY_SECONDS:
+            return MODE_LOCAL
+        try:
+            is_rs = TodoDAO.supports_change_streams()
+        except Exception as e:
+            # don't cache: a blip at startup must not pin the process to local
+            logger.warning(f"Could not detect replica set, using local change feed for now: {e}")
+            self._probe_failed_at = time.monotonic()
+            return MODE_LOCAL
+        self.mode = MODE_MONGO if is_rs else MODE_LOCAL
+        logger.info(f"Todo change feed using {self.mode} source")
+        return self.mode
+
+    def start(self):
+        """Start the Mongo watcher thread if that is the active source."""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            if self._resolve_mode() != MODE_MONGO:
+                return
+            self._watcher = threading.Thread(
+                target=self._watch, name="todo-change-feed", daemon=True
+            )
+            self._watcher.start()
+
+    def _watch(self):
+        token = None
+        while True:
+            try:
+                with TodoDAO.watch_changes(resume_after=token) as stream:
+                    for change in stream:
+                        token = stream.resume_token
+                        self._publish_change(change)
+                        if change.get("operationType") == "invalidate":
+                            # the stream is closed and can't resume after this
+                            # token; open a fresh one from now
+                            token = None
+            except OperationFailure as e:
+                if e.code == _HISTORY_LOST:
+                    logger.warning("Todo change stream history lost; resetting subscribers")
+                    token = None
+                    self.publish(RESET, None, None)
+                else:
+                    logger.warning(f"Todo change stream failed: {e}")
+                time.sleep(1)
+            except PyMongoError as e:
+                logger.warning(f"Todo change stream interrupted: {e}")
+                time.sleep(1)
+
+    def _publish_change(self, change):
+        op = _OPERATION_TYPES.get(change.get("operationType"))
+        if op is None:
+            # drop/rename/invalidate: positions are meaningless now
+            self.publish(RESET, None, None, event_id=change["_id"]["_data"])
+            return
+        todo = change.get("fullDocument")
+        if todo is not None:
+            todo = dict(todo)
+            todo["id"] = str(todo.pop("_id"))
+        todo_id = str(change["documentKey"]["_id"])
+        self.publish(op, todo_id, todo, event_id=change["_id"]["_data"])
+
+    def add_listener(self, callback):
+        """
+        Call `callback(event)` synchronously for every change seen by this process.
+
+        Listeners hear local writes immediately even when Mongo is the
+        source, so with change streams they may see a write twice. They run
+        on the writing or watcher thread and must be quick.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, event):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Todo change listener failed")
+
+    def publish_local(self, op, todo_id, todo=None):
+        """Publish a write made by this process, unless Mongo is the source."""
+        if self._resolve_mode() == MODE_LOCAL:
+            self.publish(op, todo_id, todo)
+        else:
+            # the mode may only just have been resolved after a failed probe
+            self.start()
+            self._notify({"id": None, "op": op, "todo_id": todo_id, "todo": todo})
+
+    def publish(self, op, todo_id, todo, event_id=None):
+        """Record an event and hand it to every subscriber's event loop."""
+        with self._lock:
+            if event_id is None:
+                self._counter += 1
+                event_id = f"{self._epoch}-{self._counter}"
+            event = {"id": event_id, "op": op, "todo_id": todo_id, "todo": todo}
+            if len(self._buffer) == self._buffer.maxlen:
+                self._evicted = True
+            self._buffer.append(event)
+            targets = [(loop, list(subs)) for loop, subs in self._subscribers.items()]
+        self._notify(event)
+        # one wakeup per loop, not per subscriber
+        for loop, subs in targets:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, subs, event)
+            except RuntimeError:
+                # loop already closed
+                pass
+
+    def _dispatch(self, subs, event):
+        for sub in subs:
+            if sub.stopped:
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # slow consumer: cut it off, it will resume via Last-Event-ID
+                sub.stopped = True
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a subscriber on the running event loop.
+
+        Args:
+            last_event_id (str or None): Last id the client saw.
+
+        Returns:
+            tuple: (Subscription, backlog) where backlog is the list of
+            events to replay first, or None if `last_event_id` is no longer
+            buffered and the client must refetch. `Subscription.position` is
+            the id the backlog (or a refetch) brings the client up to.
+        """
+        self.start()
+        loop = asyncio.get_event_loop()
+        sub = Subscription(self, loop, asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(loop, set()).add(sub)
+            sub.position = self._buffer[-1]["id"] if self._buffer else self._origin_id
+            backlog = []
+            if last_event_id == self._origin_id and not self._evicted:
+                backlog = list(self._buffer)
+            elif last_event_id:
+                backlog = None
+                for i, event in enumerate(self._buffer):
+                    if event["id"] == last_event_id:
+                        backlog = list(self._buffer)[i + 1:]
+                        break
+        return sub, backlog
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.loop)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.loop]
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_change_feed():
+    """Return this process's ChangeFeed singleton."""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = ChangeFeed()
+    return _feed
@@ -0,0 +1,68 @@
+"""Upgrade stored todos to the current compact schema in throttled batches."""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from todos.backends import get_backend
+from todos.schema import SCHEMA_VERSION
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrate stored todos to the current schema version in small batches, "
+        "sleeping between batches to limit load. Safe to stop and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep', type=float, default=0.1,
+                            help='Seconds to pause between batches.')
+        parser.add_argument('--max-docs', type=int, default=0,
+                            help='Stop after this many documents (0 = no limit).')
+        parser.add_argument('--drop-legacy-indexes', action='store_true',
+                            help='Drop legacy-field indexes once nothing is left to migrate.')
+
+    def _report(self, label, stats):
+        if not stats:
+            return
+        self.stdout.write(
+            f"{label}: count={stats['count']} size={stats['size']} "
+            f"avg_obj_size={stats['avg_obj_size']} storage_size={stats['storage_size']} "
+            f"total_index_size={stats['total_index_size']}"
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        try:
+            backend.ensure_indexes()
+            pending = backend.count_unmigrated()
+            self.stdout.write(f"{pending} todos below schema v{SCHEMA_VERSION}")
+            self._report("before", backend.storage_stats())
+
+            migrated = 0
+            last_id = None
+            started = time.time()
+            while True:
+                limit = options['batch_size']
+                if options['max_docs']:
+                    limit = min(limit, options['max_docs'] - migrated)
+                    if limit <= 0:
+                        break
+                count, last_id = backend.migrate_schema_batch(last_id, limit)
+                if last_id is None:
+                    break
+                migrated += count
+                self.stdout.write(f"migrated {migrated} ({time.time() - started:.1f}s)")
+                time.sleep(options['sleep'])
+
+            remaining = backend.count_unmigrated()
+            if remaining == 0 and options['drop_legacy_indexes'] and hasattr(backend, 'drop_legacy_indexes'):
+                backend.drop_legacy_indexes()
+                self.stdout.write("dropped legacy indexes")
+            self._report("after", backend.storage_stats())
+        except Exception as e:
+            raise CommandError(f"Schema migration failed: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Migrated {migrated} todos to schema v{SCHEMA_VERSION}; {remaining} remaining"
+        ))
+        if remaining == 0:
+            self.stdout.write("Set TODO_SCHEMA_LEGACY_FIELDS=0 to query compact fields only.")
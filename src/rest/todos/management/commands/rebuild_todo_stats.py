@@ -0,0 +1,17 @@
+"""Recompute the todo stats rollup from the todos collection."""
+from django.core.management.base import BaseCommand, CommandError
+from todos.service import TodoService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the todo_stats rollup with a single $facet aggregation."
+
+    def handle(self, *args, **options):
+        try:
+            stats = TodoService.rebuild_stats()
+        except Exception as e:
+            raise CommandError(f"Failed to rebuild todo stats: {e}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt todo stats: total={stats['total']} completed={stats['completed']} "
+            f"open={stats['open']} days={len(stats['created_per_day'])}"
+        ))
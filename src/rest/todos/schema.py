@@ -0,0 +1,130 @@
+"""Stored document schema for todos in MongoDB.
+
+The API uses descriptive field names; MongoDB stores compact ones plus a
+per-document schema version::
+
+    v1 (legacy): {_id, text, created_at, completed}
+    v2:          {_id, t, c, d, v: 2}
+
+Decoding works field by field (compact name wins), so legacy documents,
+migrated ones and ones partially rewritten by an update all read back the
+same. Legacy documents are upgraded with `migration_pipeline`, either
+lazily when read or in bulk by the `migrate_todo_schema` command.
+"""
+
+SCHEMA_VERSION = 2
+VERSION_FIELD = "v"
+
+# API field name -> stored field name
+FIELDS = {
+    "text": "t",
+    "created_at": "c",
+    "completed": "d",
+}
+_API_BY_STORED = {stored: api for api, stored in FIELDS.items()}
+
+# Matches documents below the current schema version (including v1, which
+# has no version field).
+UNMIGRATED = {VERSION_FIELD: {"$not": {"$gte": SCHEMA_VERSION}}}
+
+# Change stream stage dropping updates that only upgraded a document's
+# schema: only `migration_pipeline` writes the version field on update.
+SKIP_MIGRATION_CHANGES = {
+    "$match": {f"updateDescription.updatedFields.{VERSION_FIELD}": {"$exists": False}},
+}
+
+
+def stored_version(doc):
+    """Return the schema version a stored document was written with."""
+    return doc.get(VERSION_FIELD, 1)
+
+
+def needs_migration(doc):
+    return stored_version(doc) < SCHEMA_VERSION
+
+
+def encode(doc):
+    """Convert an API-shaped document to its stored form."""
+    stored = {FIELDS.get(key, key): value for key, value in doc.items()}
+    stored[VERSION_FIELD] = SCHEMA_VERSION
+    return stored
+
+
+def decode(doc):
+    """Convert a stored document of any version to its API shape."""
+    if doc is None:
+        return None
+    out = {
+        key: value for key, value in doc.items()
+        if key != VERSION_FIELD and key not in _API_BY_STORED
+    }
+    for stored, api in _API_BY_STORED.items():
+        if stored in doc:
+            out[api] = doc[stored]
+    return out
+
+
+def encode_update(fields):
+    """
+    Build an update document that $sets API fields under their stored names.
+
+    Legacy copies of the same fields are $unset so a v1 document never ends
+    up with two diverging values.
+    """
+    update = {"$set": {FIELDS.get(key, key): value for key, value in fields.items()}}
+    legacy = {key: "" for key in fields if key in FIELDS}
+    if legacy:
+        update["$unset"] = legacy
+    return update
+
+
+def translate_filter(filter_dict, legacy=True):
+    """
+    Rewrite a filter on API field names into one on stored names.
+
+    Args:
+        filter_dict (dict): Filter using API field names.
+        legacy (bool): Also match documents still using legacy names. Turn
+            off once the collection is fully migrated so every condition
+            hits a single field and its index.
+    """
+    out = {}
+    clauses = []
+    for key, cond in (filter_dict or {}).items():
+        stored = FIELDS.get(key)
+        if stored is None:
+            out[key] = cond
+        elif legacy:
+            clauses.append({"$or": [
+                {stored: cond},
+                # only fall back to the legacy name where the compact one is absent
+                {stored: {"$exists": False}, key: cond},
+            ]})
+        else:
+            out[stored] = cond
+    if clauses:
+        out["$and"] = out.get("$and", []) + clauses
+    return out
+
+
+def field_expr(api_field, legacy=True):
+    """Aggregation expression reading an API field from a stored document."""
+    stored = "$" + FIELDS[api_field]
+    if not legacy:
+        return stored
+    return {"$ifNull": [stored, "$" + api_field]}
+
+
+def migration_pipeline():
+    """
+    Update pipeline upgrading a stored document to SCHEMA_VERSION.
+
+    Runs server-side and atomically per document, so it cannot race with
+    concurrent updates; values already under compact names win.
+    """
+    set_fields = {
+        stored: {"$ifNull": ["$" + stored, {"$ifNull": ["$" + api, "$$REMOVE"]}]}
+        for api, stored in FIELDS.items()
+    }
+    set_fields[VERSION_FIELD] = SCHEMA_VERSION
+    return [{"$set": set_fields}, {"$unset": list(FIELDS)}]
@@ -1,16 +1,38 @@
 """Business logic service layer for todos."""
 import logging
+import threading
 from datetime import datetime
-from todos.dao import TodoDAO
+from todos import events
+from todos.dao import TodoDAO, TodoStatsDAO
+from todos.singleflight import SingleFlight, default_key
 
 logger = logging.getLogger(__name__)
 
 MAX_TODO_LENGTH = 200
 
+# Bumped after every write this process makes; part of the read coalescing
+# key so a read issued after a write never joins a flight started before it.
+_write_generation = 0
+_write_generation_lock = threading.Lock()
+
+
+def _note_write():
+    global _write_generation
+    with _write_generation_lock:
+        _write_generation += 1
+
+
+def _read_key(fn, args, kwargs):
+    return (_write_generation, default_key(fn, args, kwargs))
+
 
 class TodoService:
     """Service layer for todo business logic."""
 
+    # Concurrent identical reads in this process share one Mongo query.
+    # Replace with SingleFlight(key_func=...) to change how calls are keyed.
+    read_coalescer = SingleFlight(key_func=_read_key)
+
     @staticmethod
     def validate_todo_text(text):
 
@@ -41,7 +63,10 @@ class TodoService:
         
         try:
             todo = TodoDAO.create_todo(todo_data)
+            _note_write()
             logger.info(f"Todo created with id: {todo['id']}")
+            TodoService._record_stats(total=1, day=todo_data["created_at"], created=1)
+            TodoService._publish_event(events.INSERT, todo["id"], todo)
             return todo, None
         except Exception as e:
             logger.error(f"Error creating todo: {e}")
@@ -57,9 +82,12 @@ class TodoService:
             page_size (int): Number of items per page.
 
         Returns:
-            dict: Pagination metadata and todo list.
+            dict: Pagination metadata and todo list. The todo list may be
+            shared with concurrent callers and must not be mutated.
         """
-        todos, total = TodoDAO.get_todos(page=page, page_size=page_size)
+        todos, total = TodoService.read_coalescer.call(
+            TodoDAO.get_todos, page=page, page_size=page_size
+        )
         total_pages = (total + page_size - 1) // page_size
         
         return {
@@ -81,7 +109,7 @@ class TodoService:
         Returns:
             dict or None: Todo document or None if not found.
         """
-        return TodoDAO.get_todo_by_id(todo_id)
+        return TodoService.read_coalescer.call(TodoDAO.get_todo_by_id, todo_id)
 
     @staticmethod
     def update_todo(todo_id, **fields):
@@ -101,11 +129,21 @@ class TodoService:
             if not is_valid:
                 return None, error
             fields["text"] = fields["text"].strip()
+
+        # stats count `completed is True`, so only real booleans may be stored
+        if "completed" in fields and not isinstance(fields["completed"], bool):
+            return None, "Completed must be a boolean"
         
         try:
-            todo = TodoDAO.update_todo(todo_id, fields)
+            previous, todo = TodoDAO.update_todo_with_previous(todo_id, fields)
             if todo:
+                _note_write()
                 logger.info(f"Todo {todo_id} updated")
+                was_done = previous.get("completed") is True
+                is_done = todo.get("completed") is True
+                if was_done != is_done:
+                    TodoService._record_stats(completed=1 if is_done else -1)
+                TodoService._publish_event(events.UPDATE, todo_id, todo)
                 return todo, None
             else:
                 return None, "Todo not found"
@@ -125,8 +163,17 @@ class TodoService:
             tuple: (success, error_message)
         """
         try:
-            if TodoDAO.delete_todo(todo_id):
+            todo = TodoDAO.pop_todo(todo_id)
+            if todo:
+                _note_write()
                 logger.info(f"Todo {todo_id} deleted")
+                TodoService._record_stats(
+                    total=-1,
+                    completed=-1 if todo.get("completed") is True else 0,
+                    day=todo.get("created_at"),
+                    created=-1,
+                )
+                TodoService._publish_event(events.DELETE, todo_id)
                 return True, None
             else:
                 return False, "Todo not found"
@@ -134,6 +181,57 @@ class TodoService:
             logger.error(f"Error deleting todo {todo_id}: {e}")
             return False, "Failed to delete todo"
 
+    @staticmethod
+    def _record_stats(**deltas):
+        """Apply deltas to the stats rollup without failing the caller.
+
+        The todo write has already succeeded at this point; a failed rollup
+        update is logged and can be repaired with `rebuild_todo_stats`.
+        """
+        try:
+            TodoStatsDAO.increment(**deltas)
+        except Exception as e:
+            logger.warning(f"Error updating todo stats {deltas}: {e}")
+
+    @staticmethod
+    def _publish_event(op, todo_id, todo=None):
+        """Push a change to this process's feed without failing the caller."""
+        try:
+            events.get_change_feed().publish_local(op, todo_id, todo)
+        except Exception as e:
+            logger.warning(f"Error publishing todo {op} event for {todo_id}: {e}")
+
+    @staticmethod
+    def get_stats():
+        """
+        Get dashboard counters from the stats rollup.
+
+        Returns:
+            dict: total, completed and open counts plus todos created per day
+            as a date-ordered list of {"date", "count"}.
+        """
+        stats = TodoStatsDAO.get_stats() or {}
+        total = stats.get("total", 0)
+        completed = stats.get("completed", 0)
+        by_day = stats.get("created_by_day", {})
+
+        return {
+            "total": total,
+            "completed": completed,
+            "open": total - completed,
+            "created_per_day": [
+                {"date": day, "count": count}
+                for day, count in sorted(by_day.items())
+                if count > 0
+            ],
+        }
+
+    @staticmethod
+    def rebuild_stats():
+        """Recompute the stats rollup from scratch and return get_stats()."""
+        TodoStatsDAO.rebuild()
+        return TodoService.get_stats()
+
     @staticmethod
     def ensure_db_ready():
         """Ensure database is ready and indexes exist."""
@@ -0,0 +1,113 @@
+"""Single-flight coalescing of identical concurrent calls.
+
+While a call for a key is in flight, further calls with the same key wait
+for it and share its result (or exception) instead of running again.
+Nothing is cached: once the leader finishes the next call runs fresh.
+
+Shared results are handed to every waiter as the same object, so callers
+must treat them as read-only.
+"""
+import asyncio
+import threading
+import weakref
+
+
+def default_key(fn, args, kwargs):
+    """Key a call by function identity and its (hashable) arguments."""
+    return (fn.__module__, fn.__qualname__, args, frozenset(kwargs.items()))
+
+
+class _Call:
+    """An in-flight threaded call that followers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls, from threads or asyncio tasks.
+
+    Args:
+        key_func (callable): ``key_func(fn, args, kwargs)`` returning a
+            hashable key; calls with equal keys are coalesced.
+    """
+
+    def __init__(self, key_func=default_key):
+        self.key_func = key_func
+        self._lock = threading.Lock()
+        self._inflight = {}
+        # per event loop: key -> asyncio.Future
+        self._async_inflight = weakref.WeakKeyDictionary()
+        self._calls = 0
+        self._coalesced = 0
+
+    def call(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` unless an identical call is in flight."""
+        key = self.key_func(fn, args, kwargs)
+        with self._lock:
+            self._calls += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Await ``fn(*args, **kwargs)`` unless an identical call is in flight.
+
+        Coalescing is per event loop; `fn` must be a coroutine function. The
+        call runs as its own task, so cancelling any caller, including the
+        first, leaves it running for the others.
+        """
+        key = self.key_func(fn, args, kwargs)
+        loop = asyncio.get_event_loop()
+        with self._lock:
+            self._calls += 1
+            inflight = self._async_inflight.setdefault(loop, {})
+            task = inflight.get(key)
+            if task is None:
+                task = inflight[key] = loop.create_task(fn(*args, **kwargs))
+                task.add_done_callback(lambda t: self._async_done(inflight, key, t))
+            else:
+                self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def _async_done(self, inflight, key, task):
+        with self._lock:
+            if inflight.get(key) is task:
+                del inflight[key]
+        if not task.cancelled():
+            # mark retrieved so a call whose callers all left doesn't log a warning
+            task.exception()
+
+    def stats(self):
+        """Return counters: total calls, calls coalesced, calls executed."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": self._coalesced,
+                "executed": self._calls - self._coalesced,
+            }
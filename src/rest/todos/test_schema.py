@@ -0,0 +1,88 @@
+"""Tests for the stored todo schema (pure functions, no mongod needed)."""
+from datetime import datetime
+from bson import ObjectId
+from django.test import SimpleTestCase
+from todos import schema
+
+CREATED = datetime(2024, 1, 1, 12, 30)
+
+
+class EncodeDecodeTests(SimpleTestCase):
+
+    def test_encode_uses_compact_names_and_version(self):
+        oid = ObjectId()
+        stored = schema.encode(
+            {"_id": oid, "text": "buy milk", "created_at": CREATED, "completed": False}
+        )
+        self.assertEqual(stored, {"_id": oid, "t": "buy milk", "c": CREATED, "d": False, "v": 2})
+
+    def test_decode_round_trips_encode(self):
+        doc = {"_id": ObjectId(), "text": "buy milk", "created_at": CREATED, "completed": True}
+        self.assertEqual(schema.decode(schema.encode(doc)), doc)
+
+    def test_decode_legacy_document(self):
+        legacy = {"_id": 1, "text": "old", "created_at": CREATED, "completed": False}
+        self.assertEqual(schema.decode(legacy), legacy)
+        self.assertTrue(schema.needs_migration(legacy))
+        self.assertFalse(schema.needs_migration(schema.encode(legacy)))
+
+    def test_decode_prefers_compact_name(self):
+        # a v1 document partially rewritten by an update
+        doc = {"_id": 1, "text": "old", "t": "new", "created_at": CREATED}
+        self.assertEqual(schema.decode(doc), {"_id": 1, "text": "new", "created_at": CREATED})
+
+    def test_decode_none(self):
+        self.assertIsNone(schema.decode(None))
+
+
+class EncodeUpdateTests(SimpleTestCase):
+
+    def test_sets_compact_names_and_unsets_legacy(self):
+        self.assertEqual(
+            schema.encode_update({"text": "x", "completed": True}),
+            {"$set": {"t": "x", "d": True}, "$unset": {"text": "", "completed": ""}},
+        )
+
+    def test_unknown_fields_pass_through_without_unset(self):
+        self.assertEqual(schema.encode_update({"owner": "a"}), {"$set": {"owner": "a"}})
+
+    def test_never_sets_version_field(self):
+        # the change feed relies on this to tell migrations from real updates
+        update = schema.encode_update({"text": "x", "created_at": CREATED, "completed": False})
+        self.assertNotIn(schema.VERSION_FIELD, update["$set"])
+
+
+class TranslateFilterTests(SimpleTestCase):
+
+    def test_legacy_matches_either_name(self):
+        self.assertEqual(
+            schema.translate_filter({"completed": True}),
+            {"$and": [{"$or": [
+                {"d": True},
+                {"d": {"$exists": False}, "completed": True},
+            ]}]},
+        )
+
+    def test_without_legacy_uses_compact_name_only(self):
+        cond = {"$gte": CREATED}
+        self.assertEqual(
+            schema.translate_filter({"created_at": cond, "_id": 1}, legacy=False),
+            {"c": cond, "_id": 1},
+        )
+
+    def test_keeps_existing_and_clauses(self):
+        out = schema.translate_filter({"$and": [{"_id": 1}], "text": "a"})
+        self.assertEqual(out["$and"][0], {"_id": 1})
+        self.assertEqual(len(out["$and"]), 2)
+
+    def test_empty_filter(self):
+        self.assertEqual(schema.translate_filter(None), {})
+
+
+class FieldExprTests(SimpleTestCase):
+
+    def test_legacy_falls_back_to_old_name(self):
+        self.assertEqual(schema.field_expr("created_at"), {"$ifNull": ["$c", "$created_at"]})
+
+    def test_without_legacy(self):
+        self.assertEqual(schema.field_expr("created_at", legacy=False), "$c")
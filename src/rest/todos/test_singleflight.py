@@ -0,0 +1,153 @@
+"""Tests for single-flight read coalescing."""
+import asyncio
+import threading
+import time
+from django.test import SimpleTestCase
+from todos import service
+from todos.singleflight import SingleFlight
+
+
+def blocking_call(result=None, error=None):
+    """Return a function that blocks until released, recording each run."""
+
+    def call(*args):
+        call.runs += 1
+        call.started.set()
+        call.release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    call.runs = 0
+    call.started = threading.Event()
+    call.release = threading.Event()
+    return call
+
+
+class ThreadedCallTests(SimpleTestCase):
+
+    def run_concurrently(self, flight, fn, callers=5):
+        outcomes = []
+        lock = threading.Lock()
+
+        def caller():
+            try:
+                outcome = flight.call(fn, 1)
+            except Exception as e:
+                outcome = e
+            with lock:
+                outcomes.append(outcome)
+
+        leader = threading.Thread(target=caller)
+        leader.start()
+        fn.started.wait(5)
+        followers = [threading.Thread(target=caller) for _ in range(callers - 1)]
+        for t in followers:
+            t.start()
+        # followers are parked once they are counted as coalesced
+        deadline = time.monotonic() + 5
+        while flight.stats()["coalesced"] < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        fn.release.set()
+        for t in [leader] + followers:
+            t.join(5)
+        return outcomes
+
+    def test_concurrent_threads_share_one_call(self):
+        flight = SingleFlight()
+        result = ["shared"]
+        fn = blocking_call(result=result)
+        outcomes = self.run_concurrently(flight, fn)
+        self.assertEqual(fn.runs, 1)
+        self.assertEqual(len(outcomes), 5)
+        self.assertTrue(all(o is result for o in outcomes))
+        self.assertEqual(flight.stats(), {"calls": 5, "coalesced": 4, "executed": 1})
+
+    def test_concurrent_threads_share_the_exception(self):
+        flight = SingleFlight()
+        error = ValueError("boom")
+        fn = blocking_call(error=error)
+        outcomes = self.run_concurrently(flight, fn)
+        self.assertEqual(fn.runs, 1)
+        self.assertTrue(all(o is error for o in outcomes))
+
+    def test_next_call_runs_fresh(self):
+        flight = SingleFlight()
+        calls = []
+        flight.call(calls.append, 1)
+        flight.call(calls.append, 1)
+        self.assertEqual(calls, [1, 1])
+
+
+class AsyncCallTests(SimpleTestCase):
+
+    def test_cancelled_first_caller_does_not_cancel_followers(self):
+        flight = SingleFlight()
+        runs = []
+
+        async def fetch(x):
+            runs.append(x)
+            await asyncio.sleep(0.05)
+            return x * 2
+
+        async def main():
+            first = asyncio.ensure_future(flight.call_async(fetch, 2))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(flight.call_async(fetch, 2))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            result = await second
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            return result
+
+        self.assertEqual(asyncio.run(main()), 4)
+        self.assertEqual(runs, [2])
+
+    def test_exception_reaches_every_caller(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(
+                flight.call_async(fail), flight.call_async(fail), return_exceptions=True
+            )
+
+        outcomes = asyncio.run(main())
+        self.assertTrue(all(isinstance(o, ValueError) for o in outcomes))
+        self.assertEqual(flight.stats()["executed"], 1)
+
+
+class WriteGenerationTests(SimpleTestCase):
+
+    def test_read_after_write_does_not_join_earlier_flight(self):
+        flight = SingleFlight(key_func=service._read_key)
+        started = threading.Event()
+        release = threading.Event()
+        runs = []
+
+        def read(todo_id):
+            runs.append(todo_id)
+            if len(runs) == 1:
+                started.set()
+                release.wait(5)
+                return "before write"
+            return "after write"
+
+        outcomes = []
+        reader = threading.Thread(target=lambda: outcomes.append(flight.call(read, 1)))
+        reader.start()
+        started.wait(5)
+        try:
+            service._note_write()
+            # same call as the one in flight, but issued after the write
+            self.assertEqual(flight.call(read, 1), "after write")
+            self.assertEqual(flight.stats()["coalesced"], 0)
+        finally:
+            release.set()
+            reader.join(5)
+        self.assertEqual(outcomes, ["before write"])
+        self.assertEqual(runs, [1, 1])
@@ -0,0 +1,136 @@
+"""Tests for the in-memory storage backend (no mongod needed).
+
+Run from src/rest with ``python manage.py test todos``.
+"""
+from datetime import datetime, timedelta
+from bson import ObjectId
+from django.test import SimpleTestCase
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from todos.backends.memory import MemoryBackend
+
+START = datetime(2024, 1, 1)
+
+
+def make_todo(i, **fields):
+    return dict(
+        {"text": f"todo {i}", "created_at": START + timedelta(minutes=i), "completed": False},
+        **fields
+    )
+
+
+class MemoryBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        self.backend = MemoryBackend()
+
+    def assertIndexesConsistent(self):
+        backend = self.backend
+        self.assertEqual(backend._ids, sorted(backend._docs))
+        self.assertEqual(
+            backend._by_created,
+            sorted((doc["created_at"], oid) for oid, doc in backend._docs.items()),
+        )
+        for oid in backend._ids:
+            self.assertIn(oid, backend._docs)
+
+    def test_insert_and_get(self):
+        todo = self.backend.insert(make_todo(1))
+        self.assertIsInstance(todo["_id"], ObjectId)
+        self.assertEqual(self.backend.get(todo["_id"])["text"], "todo 1")
+        self.assertIsNone(self.backend.get(ObjectId()))
+
+    def test_insert_duplicate_id(self):
+        todo = self.backend.insert(make_todo(1))
+        with self.assertRaises(DuplicateKeyError):
+            self.backend.insert(make_todo(2, _id=todo["_id"]))
+        self.assertEqual(self.backend.count({}), 1)
+
+    def test_find_pages_in_id_order(self):
+        ids = self.backend.insert_many([make_todo(i) for i in range(10)])
+        page = self.backend.find({}, skip=3, limit=4)
+        self.assertEqual([doc["_id"] for doc in page], ids[3:7])
+        self.assertEqual(self.backend.count({}), 10)
+
+    def test_find_with_residual_filter(self):
+        self.backend.insert_many([make_todo(i, completed=i % 2 == 0) for i in range(10)])
+        done = self.backend.find({"completed": True}, skip=1, limit=2)
+        self.assertEqual([doc["text"] for doc in done], ["todo 2", "todo 4"])
+        self.assertEqual(self.backend.count({"completed": True}), 5)
+
+    def test_created_at_range(self):
+        self.backend.insert_many([make_todo(i) for i in range(10)])
+        query = {"created_at": {
+            "$gte": START + timedelta(minutes=2), "$lt": START + timedelta(minutes=5),
+        }}
+        self.assertEqual(
+            [doc["text"] for doc in self.backend.find(query)], ["todo 2", "todo 3", "todo 4"]
+        )
+        self.assertEqual(self.backend.count(query), 3)
+
+    def test_text_search(self):
+        self.backend.insert_many([
+            make_todo(0, text="Buy milk"),
+            make_todo(1, text="Walk the dog"),
+            make_todo(2, text="buy BREAD"),
+        ])
+        found = self.backend.find({"$text": {"$search": "buy"}})
+        self.assertEqual([doc["text"] for doc in found], ["Buy milk", "buy BREAD"])
+        self.assertEqual(self.backend.count({"$text": {"$search": "dog bread"}}), 2)
+
+    def test_update_reindexes_text_and_created_at(self):
+        todo = self.backend.insert(make_todo(1, text="old words"))
+        previous, updated = self.backend.update(
+            todo["_id"], {"text": "new words", "created_at": START - timedelta(days=1)}
+        )
+        self.assertEqual(previous["text"], "old words")
+        self.assertEqual(updated["text"], "new words")
+        self.assertEqual(self.backend.count({"$text": {"$search": "old"}}), 0)
+        self.assertEqual(self.backend.count({"$text": {"$search": "new"}}), 1)
+        self.assertEqual(self.backend.count({"created_at": {"$lt": START}}), 1)
+        self.assertIndexesConsistent()
+        self.assertEqual(self.backend.update(ObjectId(), {"completed": True}), (None, None))
+
+    def test_delete_and_delete_many(self):
+        ids = self.backend.insert_many([make_todo(i) for i in range(5)])
+        self.assertEqual(self.backend.delete(ids[0])["text"], "todo 0")
+        self.assertIsNone(self.backend.delete(ids[0]))
+        self.assertEqual(self.backend.delete_many([ids[1], ids[2], ObjectId()]), 2)
+        self.assertEqual(self.backend.count({}), 2)
+        self.assertEqual(self.backend.count({"$text": {"$search": "todo"}}), 2)
+        self.assertIndexesConsistent()
+
+    def test_insert_many_skips_duplicate_of_stored_id(self):
+        existing = self.backend.insert_many([make_todo(i) for i in range(3)])
+        batch = [make_todo(10), make_todo(11, _id=existing[1]), make_todo(12)]
+        with self.assertRaises(BulkWriteError) as ctx:
+            self.backend.insert_many(batch)
+        details = ctx.exception.details
+        self.assertEqual([e["index"] for e in details["writeErrors"]], [1])
+        self.assertEqual(details["writeErrors"][0]["code"], 11000)
+        self.assertEqual(details["nInserted"], 2)
+        # unordered, like MongoDB: the rest of the batch is stored
+        self.assertEqual(self.backend.count({}), 5)
+        self.assertEqual(self.backend.get(existing[1])["text"], "todo 1")
+        self.assertEqual(self.backend.count({"$text": {"$search": "11"}}), 0)
+        self.assertIndexesConsistent()
+
+    def test_insert_many_skips_duplicate_within_batch(self):
+        self.backend.insert_many([make_todo(i) for i in range(3)])
+        oid = ObjectId()
+        with self.assertRaises(BulkWriteError) as ctx:
+            self.backend.insert_many([make_todo(10, _id=oid), make_todo(11, _id=oid)])
+        self.assertEqual([e["index"] for e in ctx.exception.details["writeErrors"]], [1])
+        self.assertEqual(self.backend.count({}), 4)
+        self.assertEqual(self.backend.get(oid)["text"], "todo 10")
+        self.assertIndexesConsistent()
+
+    def test_rebuild_stats_counts_only_boolean_completed(self):
+        self.backend.insert_many([
+            make_todo(0, completed=True),
+            make_todo(1, completed="yes"),
+            make_todo(2),
+        ])
+        stats = self.backend.rebuild_stats()
+        self.assertEqual(stats["total"], 3)
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["created_by_day"], {"2024-01-01": 3})